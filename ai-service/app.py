@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import os
 import json
@@ -6,9 +6,11 @@ from dotenv import load_dotenv
 from pathlib import Path
 from interview import (
     conduct_interview, start_skill_assessment, load_available_roles,
-    conduct_interview_start_enhanced, conduct_interview_reply_enhanced
+    conduct_interview_start_enhanced, conduct_interview_reply_enhanced,
+    get_skill_vocabulary
 )
-from ml_similarity import SkillSimilarityEngine
+from ml_similarity import get_similarity_engine, warm_up_similarity_engine, get_engine_status, is_engine_warm, warm_up_gave_up
+from candidate_index import get_candidate_index
 import numpy as np
 
 
@@ -25,6 +27,29 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
+# The similarity engine (torch, sentence-transformers, the model) loads on
+# the first ML request, so interview-only workers start instantly. Set
+# ML_WARMUP_ON_START=true to load it in the background at start-up instead,
+# and embed the known skill vocabulary (roles.json, TOOL_PATTERNS, ...)
+ML_WARM_VOCABULARY = os.getenv('ML_WARM_VOCABULARY', 'true').lower() == 'true'
+# Refuse traffic (503) until the model and warm set are loaded; if warm-up
+# fails on every retry, traffic is admitted and /health reports the error
+ML_REQUIRE_WARM_START = os.getenv('ML_REQUIRE_WARM_START', 'false').lower() == 'true'
+
+if os.getenv('ML_WARMUP_ON_START', 'false').lower() == 'true' or ML_REQUIRE_WARM_START:
+    warm_up_similarity_engine(vocabulary=get_skill_vocabulary if (ML_WARM_VOCABULARY or ML_REQUIRE_WARM_START) else None)
+
+@app.before_request
+def require_warm_start():
+    if ML_REQUIRE_WARM_START and request.path not in ('/', '/health') and not is_engine_warm() and not warm_up_gave_up():
+        response = jsonify({
+            'success': False,
+            'error': 'Service warming up',
+            'ml_engine': get_engine_status()
+        })
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
 @app.route('/', methods=['GET'])
 def home():
     """Root endpoint with API documentation"""
@@ -38,6 +63,11 @@ def home():
             'dynamic_interview_start': 'POST /interview/dynamic/start',
             'dynamic_interview_reply': 'POST /interview/dynamic/reply',
             'get_roles': 'GET /roles',
+            'ml_skill_similarity': 'POST /ml/skill-similarity',
+            'ml_skill_similarity_batch': 'POST /ml/skill-similarity/batch',
+            'ml_match_report': 'POST /ml/match-report',
+            'ml_rank_candidates': 'POST /ml/rank-candidates',
+            'ml_candidate_search': 'POST /ml/candidates/search',
             'recruiter_interviews': 'GET /recruiter/interviews',
             'interview_details': 'GET /recruiter/interview/<id>'
         },
@@ -58,6 +88,7 @@ def health_check():
             'available_roles': list(available_roles.keys()) if available_roles else [],
             'total_roles': len(available_roles) if available_roles else 0,
             'database_available': DATABASE_AVAILABLE,
+            'ml_engine': get_engine_status(),
             'enhanced_features': {
                 'rubric_based_grading': True,
                 'dynamic_difficulty': True,
@@ -73,6 +104,7 @@ def health_check():
             'message': 'Enhanced AI service is running!', 
             'openai_configured': bool(os.getenv('OPENAI_API_KEY')),
             'available_roles': [],
+            'ml_engine': get_engine_status(),
             'error': str(e)
         })
 
@@ -293,6 +325,76 @@ def get_roles():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Bulk similarity limits
+ML_BATCH_MAX_ITEMS = int(os.getenv('ML_BATCH_MAX_ITEMS', '500'))
+ML_BATCH_STREAM_THRESHOLD = int(os.getenv('ML_BATCH_STREAM_THRESHOLD', '100'))
+ML_BATCH_CHUNK_SIZE = 100
+
+def _candidate_skill_names(candidate_enhanced_skills):
+    """Skill names from an enhanced_skills structure (or a plain list of skill names)"""
+    candidate_skills = []
+    if isinstance(candidate_enhanced_skills, list):
+        skills = candidate_enhanced_skills
+    elif candidate_enhanced_skills and 'verified_skills' in candidate_enhanced_skills:
+        skills = candidate_enhanced_skills['verified_skills']
+    else:
+        skills = []
+    
+    for skill in skills:
+        if isinstance(skill, dict):
+            candidate_skills.append(skill.get('display_name', skill.get('skill', '')))
+        elif skill:
+            candidate_skills.append(str(skill))
+    return candidate_skills
+
+def _result_cache_tags(data):
+    """Tags for memoised similarity results, so re-saving the interview invalidates them"""
+    tags = []
+    if data.get('interview_id'):
+        tags.append(f"interview:{data['interview_id']}")
+    if data.get('candidate_id'):
+        tags.append(f"candidate:{data['candidate_id']}")
+    return tuple(tags)
+
+def _stored_skill_embeddings(interview_ids):
+    """Precomputed skill_embeddings records by interview id (empty without a database)"""
+    interview_ids = [str(i) for i in interview_ids if i]
+    if not DATABASE_AVAILABLE or not interview_ids:
+        return {}
+    try:
+        return Interview.get_skill_embeddings(interview_ids)
+    except Exception as e:
+        print(f"Stored skill embeddings lookup error: {e}")
+        return {}
+
+def _iter_batch_similarity(items):
+    """Yield (id, similarity_result) for each {'id', 'job_skills', 'skills'} item, in order"""
+    engine = get_similarity_engine()
+    
+    for start in range(0, len(items), ML_BATCH_CHUNK_SIZE):
+        chunk = items[start:start + ML_BATCH_CHUNK_SIZE]
+        
+        # Items sharing a job are scored together: one job embedding, one matmul
+        groups = {}
+        for position, item in enumerate(chunk):
+            groups.setdefault(json.dumps(item['job_skills'], sort_keys=True), []).append(position)
+        
+        results = [None] * len(chunk)
+        for positions in groups.values():
+            ranked = engine.rank_candidates(
+                chunk[positions[0]]['job_skills'],
+                [
+                    {'id': chunk[p]['id'], 'skills': chunk[p]['skills'], 'skill_embeddings': chunk[p].get('skill_embeddings')}
+                    for p in positions
+                ]
+            )
+            for position, result in zip(positions, ranked['results']):
+                result.pop('candidate_id', None)
+                results[position] = result
+        
+        for item, result in zip(chunk, results):
+            yield item['id'], result
+
 @app.route('/ml/skill-similarity', methods=['POST'])
 def calculate_ml_skill_similarity():
     """Calculate ML-powered skill similarity"""
@@ -304,14 +406,11 @@ def calculate_ml_skill_similarity():
         if not job_skills:
             return jsonify({'success': False, 'error': 'job_skills required'}), 400
         
-        # Initialize ML engine
-        similarity_engine = SkillSimilarityEngine()
+        # Shared ML engine (loaded once per process)
+        similarity_engine = get_similarity_engine()
         
         # Extract candidate skills from enhanced_skills structure
-        candidate_skills = []
-        if candidate_enhanced_skills and 'verified_skills' in candidate_enhanced_skills:
-            for skill in candidate_enhanced_skills['verified_skills']:
-                candidate_skills.append(skill.get('display_name', skill.get('skill', '')))
+        candidate_skills = _candidate_skill_names(candidate_enhanced_skills)
         
         if not candidate_skills:
             return jsonify({
@@ -319,8 +418,14 @@ def calculate_ml_skill_similarity():
                 'similarity_result': {'overall_score': 0, 'matches': [], 'coverage': 0, 'method': 'no_skills'}
             })
         
+        # Precomputed candidate vectors saved with the interview, if the caller names it
+        interview_id = data.get('interview_id')
+        skill_embeddings = _stored_skill_embeddings([interview_id]).get(str(interview_id))
+        
         # Calculate ML similarity
-        result = similarity_engine.calculate_skill_similarity(job_skills, candidate_skills)
+        result = similarity_engine.calculate_skill_similarity(
+            job_skills, candidate_skills, skill_embeddings, cache_tags=_result_cache_tags(data)
+        )
         result['method'] = 'ml_similarity'
         
         return jsonify({
@@ -332,6 +437,195 @@ def calculate_ml_skill_similarity():
         print(f"ML similarity error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/ml/match-report', methods=['POST'])
+def ml_match_report():
+    """Match score, matches, skill gaps and suggestions for one job/candidate pair"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        job_skills = data.get('job_skills', [])
+        if not job_skills:
+            return jsonify({'success': False, 'error': 'job_skills required'}), 400
+        
+        candidate_skills = _candidate_skill_names(data.get('candidate_enhanced_skills', {}))
+        if not candidate_skills:
+            return jsonify({
+                'success': True,
+                'match_report': {'overall_score': 0, 'matches': [], 'coverage': 0, 'gaps': [], 'suggestions': [], 'method': 'no_skills'}
+            })
+        
+        interview_id = data.get('interview_id')
+        skill_embeddings = _stored_skill_embeddings([interview_id]).get(str(interview_id))
+        
+        report = get_similarity_engine().match_report(
+            job_skills, candidate_skills, skill_embeddings,
+            gap_threshold=float(data.get('gap_threshold', 0.65)),
+            cache_tags=_result_cache_tags(data)
+        )
+        
+        return jsonify({
+            'success': True,
+            'match_report': dict(report, method='ml_similarity')
+        })
+        
+    except Exception as e:
+        print(f"ML match report error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/ml/rank-candidates', methods=['POST'])
+def rank_candidates_for_job():
+    """Rank many candidates against one job in a single similarity computation"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        job_skills = data.get('job_skills', [])
+        candidates = data.get('candidates', [])
+        
+        if not job_skills:
+            return jsonify({'success': False, 'error': 'job_skills required'}), 400
+        if not isinstance(candidates, list):
+            return jsonify({'success': False, 'error': 'candidates must be a list'}), 400
+        if len(candidates) > ML_BATCH_MAX_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'Too many candidates: {len(candidates)} (max {ML_BATCH_MAX_ITEMS})'
+            }), 413
+        
+        # Each candidate: {'id': ..., 'candidate_enhanced_skills': {...}, 'interview_id': optional}
+        stored = _stored_skill_embeddings([candidate.get('interview_id') for candidate in candidates])
+        engine_candidates = [
+            {
+                'id': candidate.get('id', candidate.get('candidate_id', i)),
+                'skills': _candidate_skill_names(candidate.get('candidate_enhanced_skills', {})),
+                'skill_embeddings': stored.get(str(candidate.get('interview_id')))
+            }
+            for i, candidate in enumerate(candidates)
+        ]
+        
+        result = get_similarity_engine().rank_candidates(job_skills, engine_candidates, top_k=data.get('top_k'))
+        
+        return jsonify({
+            'success': True,
+            'ranking': result['ranking'],
+            'results': result['results'],
+            'candidates_count': result['candidates_count']
+        })
+        
+    except Exception as e:
+        print(f"ML ranking error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/ml/skill-similarity/batch', methods=['POST'])
+def calculate_ml_skill_similarity_batch():
+    """Bulk /ml/skill-similarity: one job with many candidates, or many job/candidate pairs"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        # Either {'job_skills': [...], 'candidates': [{'id', 'candidate_enhanced_skills'}]}
+        # or {'pairs': [{'id', 'job_skills', 'candidate_enhanced_skills'}]}
+        if 'pairs' in data:
+            raw_items = data.get('pairs') or []
+            shared_job_skills = None
+        else:
+            raw_items = data.get('candidates') or []
+            shared_job_skills = data.get('job_skills', [])
+            if not shared_job_skills:
+                return jsonify({'success': False, 'error': 'job_skills required'}), 400
+        
+        if not isinstance(raw_items, list) or not raw_items:
+            return jsonify({'success': False, 'error': 'candidates or pairs must be a non-empty list'}), 400
+        if len(raw_items) > ML_BATCH_MAX_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'Batch too large: {len(raw_items)} items (max {ML_BATCH_MAX_ITEMS})'
+            }), 413
+        
+        stored = _stored_skill_embeddings([raw.get('interview_id') for raw in raw_items])
+        items = []
+        for i, raw in enumerate(raw_items):
+            job_skills = shared_job_skills if shared_job_skills is not None else raw.get('job_skills', [])
+            if not job_skills:
+                return jsonify({'success': False, 'error': f'job_skills required for item {i}'}), 400
+            items.append({
+                'id': raw.get('id', raw.get('candidate_id', i)),
+                'job_skills': job_skills,
+                'skills': _candidate_skill_names(raw.get('candidate_enhanced_skills', {})),
+                'skill_embeddings': stored.get(str(raw.get('interview_id')))
+            })
+        
+        stream = request.args.get('stream', '').lower() in ('1', 'true') or len(items) > ML_BATCH_STREAM_THRESHOLD
+        
+        if not stream:
+            results = [
+                {'id': item_id, 'similarity_result': result}
+                for item_id, result in _iter_batch_similarity(items)
+            ]
+            return jsonify({'success': True, 'count': len(results), 'results': results})
+        
+        # Large batches: stream results as each chunk is scored. 'success' comes
+        # last so a failure part-way through is still reported in valid JSON.
+        def generate():
+            yield '{"count": %d, "results": [' % len(items)
+            try:
+                for i, (item_id, result) in enumerate(_iter_batch_similarity(items)):
+                    yield (',' if i else '') + json.dumps({'id': item_id, 'similarity_result': result})
+                yield '], "success": true}'
+            except Exception as e:
+                print(f"ML batch similarity stream error: {e}")
+                yield '], "success": false, "error": %s}' % json.dumps(str(e))
+        
+        return Response(stream_with_context(generate()), mimetype='application/json')
+        
+    except Exception as e:
+        print(f"ML batch similarity error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/ml/candidates/search', methods=['POST'])
+def search_candidates_for_job():
+    """Approximate top-K candidates whose verified skills cover the job skills"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        job_skills = data.get('job_skills', [])
+        if not job_skills:
+            return jsonify({'success': False, 'error': 'job_skills required'}), 400
+        try:
+            top_k = int(data.get('top_k', 20))
+            n_probe = int(data['n_probe']) if data.get('n_probe') is not None else None
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'top_k and n_probe must be integers'}), 400
+        if top_k < 1 or (n_probe is not None and n_probe < 1):
+            return jsonify({'success': False, 'error': 'top_k and n_probe must be positive'}), 400
+        
+        engine = get_similarity_engine()
+        # Loading, catch-up with other workers and rebuilds run in the background
+        index = get_candidate_index(engine)
+        
+        candidates = index.search(
+            engine.embed_skills(job_skills),
+            top_k=top_k,
+            n_probe=n_probe,
+            min_similarity=engine.thresholds['weak_match']
+        )
+        
+        return jsonify({
+            'success': True,
+            'candidates': candidates,
+            'index': index.stats()
+        })
+        
+    except Exception as e:
+        print(f"Candidate search error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # Enhanced recruiter endpoints (if database available)
 if DATABASE_AVAILABLE:
     @app.route('/recruiter/interviews', methods=['GET'])
@@ -1,21 +1,10 @@
 # baseline_matching.py
 from typing import List, Dict, Callable, Tuple, Set
+from skill_canonicaliser import get_canonicaliser
 
 def canonicalise(tokens: List[str], tool_patterns: Dict[str, List[str]]) -> Set[str]:
     """Map raw tokens to canonical forms using TOOL_PATTERNS; lowercased exact matching."""
-    out = set()
-    for raw in tokens:
-        t = raw.strip().lower()
-        mapped = None
-        for canon, variants in tool_patterns.items():
-            for v in variants:
-                # normalise variant spacing/punct for simple contains/equality checks
-                if t == v.strip().lower():
-                    mapped = canon
-                    break
-            if mapped: break
-        out.add(mapped if mapped else t)
-    return out
+    return get_canonicaliser(tool_patterns).canonicalise(tokens)
 
 def skill_overlap_percent(job_skills_norm: Set[str], cand_skills_norm: Set[str]) -> float:
     if not job_skills_norm:
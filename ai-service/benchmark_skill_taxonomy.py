@@ -0,0 +1,109 @@
+# benchmark_skill_taxonomy.py - Frozen taxonomy indexes vs per-call table rebuilds
+#
+# validate_skill_name, get_role_key, get_skill_synonyms and
+# calculate_job_relevance used to rebuild their tables on every call and scan
+# them linearly. The legacy_* functions below reproduce that (tables are
+# rebuilt from the module constants, as the inline literals were), check
+# the indexed versions return identical answers for every known skill and
+# role, and time both.
+#
+# Usage: python benchmark_skill_taxonomy.py [--repeats N]
+import os
+import sys
+import time
+
+os.environ.setdefault('OPENAI_API_KEY', 'benchmark-placeholder')  # interview.py builds a client at import
+from interview import (
+    ROLE_SKILLS, ROLE_KEY_MAPPINGS, SKILL_SYNONYMS_DB, JOB_SKILL_RELEVANCE,
+    validate_skill_name, get_role_key, get_skill_synonyms, calculate_job_relevance
+)
+
+def _rebuild(table):
+    """Fresh copy of a nested dict-of-lists table, what an inline literal costs per call"""
+    if isinstance(table, dict):
+        return {key: _rebuild(value) for key, value in table.items()}
+    return list(table)
+
+def legacy_validate_skill_name(skill_name, role="Data Analyst"):
+    role_skills_table = _rebuild(ROLE_SKILLS)
+    role_mappings = {key: key for key in role_skills_table}
+    role_key = role_mappings.get(role.lower().replace(" ", "_").replace("-", "_"), "data_analyst")
+    skill_lower = skill_name.lower().strip()
+    for category, skills in role_skills_table.get(role_key, role_skills_table["data_analyst"]).items():
+        if skill_lower in skills:
+            return True, category
+    return False, "unknown"
+
+def legacy_get_role_key(job_title):
+    role_mappings = dict(ROLE_KEY_MAPPINGS)
+    return role_mappings.get(job_title.lower().replace(" ", "_").replace("-", "_"), "data_analyst")
+
+def legacy_get_skill_synonyms(skill_name):
+    synonyms_db = _rebuild(SKILL_SYNONYMS_DB)
+    skill_lower = skill_name.lower().strip()
+    if skill_lower in synonyms_db:
+        return synonyms_db[skill_lower]
+    for main_skill, synonyms in synonyms_db.items():
+        if skill_lower in synonyms:
+            return [main_skill] + [s for s in synonyms if s != skill_lower]
+    return []
+
+def legacy_calculate_job_relevance(skill_name, job_title):
+    job_skill_relevance = _rebuild(JOB_SKILL_RELEVANCE)
+    skill_lower = skill_name.lower()
+    job_key = job_title.lower().replace(' ', '_')
+    if job_key in job_skill_relevance:
+        for relevance_level, skills in job_skill_relevance[job_key].items():
+            if any(s in skill_lower for s in skills):
+                return {'high': 1.0, 'medium': 0.7, 'low': 0.3}[relevance_level]
+    return 0.5
+
+def build_cases():
+    """Every known skill and synonym (plus some unknowns) against every role title"""
+    skills = {skill for categories in ROLE_SKILLS.values() for names in categories.values() for skill in names}
+    for main_skill, synonyms in SKILL_SYNONYMS_DB.items():
+        skills.add(main_skill)
+        skills.update(synonyms)
+    skills.update(['Python ', 'SQL', 'underwater basket weaving', 'team leadership skills', ''])
+    roles = [key.replace('_', ' ').title() for key in ROLE_KEY_MAPPINGS] + ['Astronaut']
+    return sorted(skills), roles
+
+def benchmark(repeats=20):
+    skills, roles = build_cases()
+    pairs = [(skill, role) for skill in skills for role in roles]
+    functions = [
+        ('validate_skill_name', validate_skill_name, legacy_validate_skill_name, pairs),
+        ('calculate_job_relevance', calculate_job_relevance, legacy_calculate_job_relevance, pairs),
+        ('get_skill_synonyms', get_skill_synonyms, legacy_get_skill_synonyms, [(skill,) for skill in skills]),
+        ('get_role_key', get_role_key, legacy_get_role_key, [(role,) for role in roles]),
+    ]
+
+    results = []
+    for name, indexed, legacy, cases in functions:
+        mismatches = sum(1 for args in cases if indexed(*args) != legacy(*args))
+
+        def _timed(fn):
+            started = time.perf_counter()
+            for _ in range(repeats):
+                for args in cases:
+                    fn(*args)
+            return (time.perf_counter() - started) / (repeats * len(cases)) * 1e6
+
+        legacy_us, indexed_us = _timed(legacy), _timed(indexed)
+        results.append({
+            'function': name,
+            'calls': len(cases),
+            'mismatches': mismatches,
+            'legacy_us': round(legacy_us, 2),
+            'indexed_us': round(indexed_us, 2),
+            'speedup': round(legacy_us / indexed_us, 1) if indexed_us else None,
+        })
+    return results
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[sys.argv.index('--repeats') + 1]) if '--repeats' in sys.argv else 20
+    results = benchmark(repeats)
+    print(f"{'function':<26}{'calls':>7}{'mismatches':>12}{'legacy us':>12}{'indexed us':>12}{'speedup':>9}")
+    for r in results:
+        print(f"{r['function']:<26}{r['calls']:>7}{r['mismatches']:>12}{r['legacy_us']:>12}{r['indexed_us']:>12}{r['speedup']:>8}x")
+    sys.exit(1 if any(r['mismatches'] for r in results) else 0)
@@ -0,0 +1,110 @@
+# benchmark_tool_extraction.py - Single-pass ToolMatcher vs per-pattern regex checks
+#
+# Builds a corpus of candidate introductions (or reads one, one introduction
+# per line), checks that TOOL_MATCHER.find() returns exactly what the old
+# per-pattern loop in analyze_introduction returned, and times both.
+#
+# Usage: python benchmark_tool_extraction.py [introductions.txt] [--size N] [--repeats N]
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault('OPENAI_API_KEY', 'benchmark-placeholder')  # interview.py builds a client at import
+from interview import TOOL_PATTERNS, TOOL_MATCHER, _compile_for_check
+
+OPENERS = [
+    "Hi, I'm {name} and I've spent {years} years as a {role}.",
+    "My name is {name}. I work as a {role} and have about {years} years of experience.",
+    "Hello! I'm a {role} with {years} years in the industry.",
+]
+TOOL_SENTENCES = [
+    "Day to day I use {a} and {b}, and I've recently picked up {c}.",
+    "Most of my projects involved {a}; before that I worked heavily with {b}.",
+    "I'm comfortable with {a}, {b} and {c}, and I mentor juniors on {a}.",
+    "We moved our reporting from {a} to {b} last year.",
+]
+FILLER = [
+    "I enjoy working closely with stakeholders and turning requirements into delivered work.",
+    "Outside of work I volunteer at a local coding club and keep up with the inventory of new frameworks.",
+    "I led a small team through a migration and improved delivery times by around 20%.",
+    "I'm looking for a role where I can grow into more strategic, cross-functional work.",
+    "My degree was in engineering and I have a strong interest in data-driven decision making.",
+]
+NAMES = ['Alex', 'Sam', 'Priya', 'Jordan', 'Chen', 'Fatima', 'Tom', 'Aisha']
+ROLES = ['data analyst', 'software engineer', 'project manager', 'sales executive', 'mechanical engineer']
+
+def legacy_find_tools(text):
+    """The per-pattern loop analyze_introduction used before ToolMatcher"""
+    tools = []
+    for tool_name, patterns in TOOL_PATTERNS.items():
+        for pattern in patterns:
+            if _compile_for_check(pattern).search(text):
+                display_name = tool_name.replace('_', ' ').title()
+                if display_name not in tools:
+                    tools.append(display_name)
+                break
+    return tools
+
+def build_corpus(size, seed=7):
+    """Synthetic introductions mentioning a random mix of TOOL_PATTERNS variants"""
+    rng = random.Random(seed)
+    literal_variants = [v for variants in TOOL_PATTERNS.values() for v in variants if '(' not in v]
+    corpus = []
+    for _ in range(size):
+        picks = [rng.choice(literal_variants) for _ in range(3)]
+        picks = [p.upper() if rng.random() < 0.2 else p for p in picks]
+        parts = [rng.choice(OPENERS).format(name=rng.choice(NAMES), years=rng.randint(1, 15), role=rng.choice(ROLES))]
+        for _ in range(rng.randint(1, 3)):
+            parts.append(rng.choice(TOOL_SENTENCES).format(a=picks[0], b=picks[1], c=picks[2]))
+            parts.extend(rng.sample(FILLER, 2))
+        corpus.append(' '.join(parts))
+    return corpus
+
+def benchmark(corpus, repeats=5):
+    mismatches = [text for text in corpus if TOOL_MATCHER.find(text) != legacy_find_tools(text)]
+
+    def _timed(fn):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for text in corpus:
+                fn(text)
+        return (time.perf_counter() - started) / (repeats * len(corpus)) * 1e6
+
+    legacy_us = _timed(legacy_find_tools)
+    matcher_us = _timed(TOOL_MATCHER.find)
+    return {
+        'introductions': len(corpus),
+        'avg_chars': round(sum(len(t) for t in corpus) / len(corpus)),
+        'mismatches': len(mismatches),
+        'legacy_us_per_intro': round(legacy_us, 1),
+        'matcher_us_per_intro': round(matcher_us, 1),
+        'speedup': round(legacy_us / matcher_us, 2) if matcher_us else None,
+    }, mismatches
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    size, repeats, path = 500, 5, None
+    while args:
+        arg = args.pop(0)
+        if arg == '--size':
+            size = int(args.pop(0))
+        elif arg == '--repeats':
+            repeats = int(args.pop(0))
+        else:
+            path = arg
+
+    if path:
+        with open(path, encoding='utf-8') as f:
+            corpus = [line.strip() for line in f if line.strip()]
+    else:
+        corpus = build_corpus(size)
+
+    results, mismatches = benchmark(corpus, repeats)
+    for key, value in results.items():
+        print(f"{key:<22} {value}")
+    for text in mismatches[:5]:
+        print(f"\nMISMATCH: {text[:120]}...")
+        print(f"  legacy:  {legacy_find_tools(text)}")
+        print(f"  matcher: {TOOL_MATCHER.find(text)}")
+    sys.exit(1 if mismatches else 0)
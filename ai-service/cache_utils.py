@@ -0,0 +1,225 @@
+# cache_utils.py - Bounded in-memory caches shared by the ML services
+import os
+import json
+import time
+import atexit
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and/or total bytes, with optional expiry"""
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None, ttl=None):
+        """max_entries / max_bytes / ttl (seconds) of None mean unbounded; sizeof(value) -> bytes"""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.ttl = ttl
+
+        self._data = OrderedDict()   # key -> (value, size, expires_at), oldest first
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def nbytes(self):
+        """Total size of cached values, maintained incrementally"""
+        return self._bytes
+
+    def get(self, key, default=None):
+        """Cached value (marking it most recently used), or default"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                del self._data[key]
+                self._bytes -= entry[1]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, ttl=None):
+        """Insert or replace a value, evicting least recently used entries to stay in bounds
+
+        ttl overrides the cache-wide expiry for this entry.
+        """
+        size = int(self.sizeof(value))
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # would evict everything and still not fit
+            ttl = ttl if ttl is not None else self.ttl
+            expires_at = time.monotonic() + ttl if ttl else None
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+            self._evict()
+
+    def pop(self, key, default=None):
+        """Remove key and return its value"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def items(self):
+        """(key, value, seconds until expiry or None) for live entries, oldest first"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value, None if expires_at is None else expires_at - now)
+                for key, (value, _, expires_at) in self._data.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Size, bounds and hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'ttl': self.ttl,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _evict(self):
+        """Drop oldest entries until both bounds hold (caller holds the lock)"""
+        while self._data and (
+            (self.max_entries is not None and len(self._data) > self.max_entries) or
+            (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, size, _) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+class ResultCache:
+    """LRU + TTL cache of JSON-serialisable results with tag invalidation and optional persistence
+
+    Entries can carry tags (e.g. "interview:<id>"); invalidate(tag) drops
+    every entry stored under it. With a path, live entries are written to a
+    JSON file at exit and reloaded (with their remaining TTL) on start.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, path=None):
+        self._cache = LRUCache(max_entries=max_entries, ttl=ttl)
+        self._tags = {}          # tag -> keys stored under it (may include evicted keys)
+        self._lock = threading.Lock()
+        self.invalidations = 0
+        self.path = path
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def put(self, key, value, tags=(), ttl=None):
+        self._cache.put(key, value, ttl=ttl)
+        if tags:
+            with self._lock:
+                for tag in tags:
+                    self._tags.setdefault(tag, set()).add(key)
+                if self._cache.max_entries and len(self._tags) > 2 * self._cache.max_entries:
+                    self._prune_tags()
+
+    def invalidate(self, *tags):
+        """Drop every entry stored under any of tags; returns how many were removed"""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if self._cache.pop(key) is not None:
+                        removed += 1
+        self.invalidations += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._tags.clear()
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats.update({'tags': len(self._tags), 'invalidations': self.invalidations, 'persistent': bool(self.path)})
+        return stats
+
+    def save(self):
+        """Write live entries to the persistence file (atomic replace)"""
+        if not self.path:
+            return
+        try:
+            now = time.time()
+            with self._lock:
+                key_tags = {}
+                for tag, keys in self._tags.items():
+                    for key in keys:
+                        key_tags.setdefault(key, []).append(tag)
+            entries = [
+                [key, value, None if remaining is None else now + remaining, key_tags.get(key, [])]
+                for key, value, remaining in self._cache.items()
+            ]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': entries}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Warning: Could not save result cache: {e}")
+
+    def load(self):
+        """Reload entries saved by a previous process, skipping expired ones"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)['entries']
+        except Exception as e:
+            print(f"Warning: Could not load result cache: {e}")
+            return 0
+        now = time.time()
+        loaded = 0
+        for key, value, expires_at, tags in entries:
+            if expires_at is not None and expires_at <= now:
+                continue
+            self.put(key, value, tags=tags, ttl=None if expires_at is None else expires_at - now)
+            loaded += 1
+        return loaded
+
+    def _prune_tags(self):
+        """Forget keys the LRU has already evicted (caller holds the lock)"""
+        for tag in list(self._tags):
+            live = {key for key in self._tags[tag] if key in self._cache}
+            if live:
+                self._tags[tag] = live
+            else:
+                del self._tags[tag]
@@ -0,0 +1,517 @@
+# candidate_index.py - Approximate nearest-neighbour search over candidate skill vectors
+import os
+import json
+import time
+import threading
+import numpy as np
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# ===========================================
+# IVF INDEX (numpy only)
+# ===========================================
+#
+# Every verified skill of every indexed interview is one L2-normalised row.
+# Rows are partitioned into inverted lists around spherical k-means
+# centroids. A query probes the n_probe closest lists per job skill, keeps
+# each candidate's best similarity per job skill, and ranks candidates by
+# the mean over job skills - the same "overall_score" as
+# SkillSimilarityEngine, restricted to the probed rows.
+
+INDEX_FILE = 'candidate_index.npz'
+
+# Catch-up queries re-read this much before synced_at, so an interview
+# committed by another worker just after a later one is not skipped
+SYNC_OVERLAP = timedelta(minutes=5)
+
+def _normalise(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def _spherical_kmeans(data, k, iterations=10, seed=0):
+    """Centroids for L2-normalised data (cosine k-means), fully vectorised"""
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        counts = np.bincount(assign, minlength=k)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty lists from random points
+            sums[empty] = data[rng.choice(len(data), size=int(empty.sum()))]
+        centroids = _normalise(sums)
+    return centroids
+
+class CandidateSkillIndex:
+    """IVF approximate nearest-neighbour index: top-K candidates whose skills cover a job's skills"""
+
+    def __init__(self, n_probe=8, rebuild_ratio=0.5, rebuild_interval_sec=3600, min_rows_for_ivf=2048,
+                 encoder_name=None):
+        self.n_probe = n_probe
+        self.encoder_name = encoder_name   # vectors only compare with queries from the same encoder
+        self.rebuild_ratio = rebuild_ratio
+        self.rebuild_interval_sec = rebuild_interval_sec
+        self.min_rows_for_ivf = min_rows_for_ivf
+
+        self.dim = None
+        self._vectors = np.zeros((0, 0), dtype=np.float32)   # grows by doubling
+        self._owner = np.zeros(0, dtype=np.int64)            # row -> candidate slot
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+
+        self._ids = []            # slot -> interview id
+        self._meta = []           # slot -> {'candidate_id': ..., 'skills': [...]}
+        self._slot = {}           # interview id -> slot
+
+        self._centroids = None
+        self._lists = []          # list id -> row numbers
+        self._unassigned = np.zeros(0, dtype=np.int64)      # rows added before the first build
+        self._built_rows = 0
+        self._inserted_since_build = 0
+        self._built_at = 0.0
+        self.synced_at = None     # latest interview completed_at included
+        self.ready = True         # False for the placeholder served while the first load runs
+
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()   # one build (or save) at a time
+
+    def __len__(self):
+        return len(self._slot)
+
+    # ---------- writes ----------
+
+    def add_candidate(self, interview_id, vectors, candidate_id=None, skills=None):
+        """Insert (or replace) one interview's skill vectors"""
+        vectors = _normalise(vectors)
+        if vectors.shape[0] == 0:
+            return
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Vector dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+
+            interview_id = str(interview_id)
+            self._remove_rows(interview_id)
+            slot = self._slot.get(interview_id)
+            if slot is None:
+                slot = len(self._ids)
+                self._ids.append(interview_id)
+                self._meta.append(None)
+                self._slot[interview_id] = slot
+            self._meta[slot] = {'candidate_id': str(candidate_id) if candidate_id is not None else None, 'skills': list(skills or [])}
+
+            rows = self._append_rows(vectors, slot)
+
+            # Incremental insert into the nearest existing lists
+            if self._centroids is not None:
+                assign = np.argmax(vectors @ self._centroids.T, axis=1)
+                for list_id in np.unique(assign):
+                    self._lists[list_id] = np.concatenate([self._lists[list_id], rows[assign == list_id]])
+            else:
+                self._unassigned = np.concatenate([self._unassigned, rows])
+            self._inserted_since_build += len(rows)
+
+    def remove_candidate(self, interview_id):
+        with self._lock:
+            self._remove_rows(str(interview_id))
+
+    def build(self):
+        """(Re)build the inverted lists with k-means over all live rows
+
+        k-means and the bulk assignment run without holding the index lock,
+        over the rows present when the build started (persisted rows are
+        never rewritten in place), so searches and inserts carry on; rows
+        added meanwhile are assigned when the new lists are swapped in.
+        """
+        with self._build_lock:
+            with self._lock:
+                self._compact()
+                n_rows = self._size
+                data = self._vectors[:n_rows]
+                if n_rows < self.min_rows_for_ivf:
+                    # Small pools: exact scan is already fast
+                    self._centroids = None
+                    self._lists = []
+                    self._unassigned = np.arange(n_rows, dtype=np.int64)
+                    self._inserted_since_build = 0
+                    self._built_at = time.time()
+                    self._built_rows = n_rows
+                    return
+
+            n_lists = int(min(4096, max(8, np.sqrt(n_rows))))
+            sample_size = min(n_rows, n_lists * 256)
+            sample = data[np.random.default_rng(0).choice(n_rows, size=sample_size, replace=False)]
+            centroids = _spherical_kmeans(sample, n_lists)
+
+            assign = np.empty(n_rows, dtype=np.int64)
+            for start in range(0, n_rows, 65536):
+                assign[start:start + 65536] = np.argmax(data[start:start + 65536] @ centroids.T, axis=1)
+
+            with self._lock:
+                # Only build() and save() compact, and both hold _build_lock, so row numbers are unchanged
+                if self._size > n_rows:
+                    late = np.argmax(self._vectors[n_rows:self._size] @ centroids.T, axis=1)
+                    assign = np.concatenate([assign, late])
+                order = np.argsort(assign, kind='stable')
+                bounds = np.searchsorted(assign[order], np.arange(n_lists + 1))
+                self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(n_lists)]
+                self._centroids = centroids
+                self._unassigned = np.zeros(0, dtype=np.int64)
+                self._inserted_since_build = 0
+                self._built_at = time.time()
+                self._built_rows = self._size
+                print(f"✅ Candidate index built: {len(self)} candidates, {self._size} skill vectors, {n_lists} lists")
+
+    def rebuild_if_stale(self):
+        """Periodic rebuild: after enough inserts, or when the lists are old"""
+        with self._lock:
+            if self._size == 0:
+                return False
+            grew = self._inserted_since_build > max(self.min_rows_for_ivf, self._built_rows) * self.rebuild_ratio
+            aged = (self._inserted_since_build > 0 and self.rebuild_interval_sec
+                    and time.time() - self._built_at > self.rebuild_interval_sec)
+        if grew or aged:
+            self.build()
+            return True
+        return False
+
+    # ---------- queries ----------
+
+    def search(self, job_vectors, top_k=10, n_probe=None, min_similarity=0.45):
+        """Top-K candidates by mean best similarity over the job's skills (best interview per candidate)"""
+        job_vectors = _normalise(job_vectors)
+        n_jobs = job_vectors.shape[0]
+        with self._lock:
+            if not self._slot or n_jobs == 0:
+                return []
+            n_probe = n_probe or self.n_probe
+
+            if self._centroids is not None:
+                centroid_sims = job_vectors @ self._centroids.T
+                n_probe = min(n_probe, centroid_sims.shape[1])
+                probes = np.argpartition(-centroid_sims, n_probe - 1, axis=1)[:, :n_probe]
+
+            owners, job_index, sims = [], [], []
+            for j in range(n_jobs):
+                parts = [self._unassigned]
+                if self._centroids is not None:
+                    parts.extend(self._lists[list_id] for list_id in probes[j])
+                rows = np.concatenate(parts)
+                rows = rows[self._alive[rows]]
+                if rows.size == 0:
+                    continue
+                owners.append(self._owner[rows])
+                job_index.append(np.full(rows.size, j, dtype=np.int64))
+                sims.append(self._vectors[rows] @ job_vectors[j])
+            if not owners:
+                return []
+
+            owners = np.concatenate(owners)
+            job_index = np.concatenate(job_index)
+            sims = np.concatenate(sims)
+
+            # Best similarity per (candidate, job skill); cost scales with probed rows, not pool size
+            pair_keys, inverse = np.unique(owners * n_jobs + job_index, return_inverse=True)
+            best = np.full(pair_keys.size, -1.0, dtype=np.float32)
+            np.maximum.at(best, inverse, sims)
+            best = np.maximum(best, 0.0)
+
+            pair_owner = pair_keys // n_jobs
+            candidates, pair_to_candidate = np.unique(pair_owner, return_inverse=True)
+            totals = np.bincount(pair_to_candidate, weights=best, minlength=candidates.size)
+            covered = np.bincount(pair_to_candidate, weights=(best >= min_similarity), minlength=candidates.size)
+
+            # Job skills with no probed row count as 0
+            scores = totals / n_jobs
+
+            # Entries are interviews: keep each candidate's best-scoring one
+            results, seen = [], set()
+            for i in np.argsort(-scores, kind='stable'):
+                meta = self._meta[candidates[i]]
+                owner = meta['candidate_id'] or self._ids[candidates[i]]
+                if owner in seen:
+                    continue
+                seen.add(owner)
+                results.append({
+                    'interview_id': self._ids[candidates[i]],
+                    'candidate_id': meta['candidate_id'],
+                    'score': round(float(scores[i]) * 100, 2),
+                    'coverage': round(float(covered[i]) / n_jobs * 100, 2)
+                })
+                if len(results) >= max(1, int(top_k)):
+                    break
+            return results
+
+    def stats(self):
+        return {
+            'candidates': len(self),
+            'vectors': int(self._alive[:self._size].sum()),
+            'lists': len(self._lists),
+            'mode': 'ivf' if self._centroids is not None else 'exact',
+            'ready': self.ready,
+            'encoder_name': self.encoder_name,
+            'dim': self.dim,
+            'n_probe': self.n_probe,
+            'inserted_since_build': self._inserted_since_build,
+            'built_at': self._built_at or None,
+            'synced_at': self.synced_at.isoformat() if self.synced_at else None
+        }
+
+    # ---------- persistence ----------
+
+    def save(self, path):
+        """Write the index to an .npz file (atomic replace)"""
+        with self._build_lock, self._lock:
+            self._compact()
+            path = Path(path)
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    vectors=self._vectors[:self._size],
+                    owner=self._owner[:self._size],
+                    centroids=self._centroids if self._centroids is not None else np.zeros((0, self.dim or 0), dtype=np.float32),
+                    list_sizes=np.array([len(rows) for rows in self._lists], dtype=np.int64),
+                    list_rows=np.concatenate(self._lists) if self._lists else np.zeros(0, dtype=np.int64),
+                    ids=np.array(json.dumps({
+                        'encoder_name': self.encoder_name,
+                        'dim': self.dim,
+                        'ids': self._ids,
+                        'meta': self._meta,
+                        'built_at': self._built_at,
+                        'synced_at': self.synced_at.isoformat() if self.synced_at else None
+                    }))
+                )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, encoder_name=None, dim=None, **kwargs):
+        """Index from an .npz file; ValueError if it was built for another encoder or dimension"""
+        index = cls(encoder_name=encoder_name, **kwargs)
+        with np.load(path) as data:
+            vectors = data['vectors']
+            info = json.loads(str(data['ids']))
+            saved_dim = info.get('dim', int(vectors.shape[1]) if vectors.size else None)
+            # Files written before the encoder was recorded cannot be trusted either
+            if encoder_name is not None and info.get('encoder_name') != encoder_name:
+                raise ValueError(f"index was built with encoder '{info.get('encoder_name')}', not '{encoder_name}'")
+            if dim is not None and saved_dim is not None and int(saved_dim) != int(dim):
+                raise ValueError(f"index dimension {saved_dim} does not match embedding dimension {dim}")
+            index.dim = int(saved_dim) if saved_dim is not None else None
+            index._vectors = vectors.astype(np.float32)
+            index._owner = data['owner'].astype(np.int64)
+            index._size = vectors.shape[0]
+            index._alive = np.ones(index._size, dtype=bool)
+            index._ids = info['ids']
+            index._meta = info['meta']
+            index._slot = {interview_id: slot for slot, interview_id in enumerate(index._ids)}
+            index._built_at = info.get('built_at') or 0.0
+            index.synced_at = datetime.fromisoformat(info['synced_at']) if info.get('synced_at') else None
+            index._built_rows = index._size
+            if data['centroids'].size:
+                index._centroids = data['centroids']
+                bounds = np.concatenate([[0], np.cumsum(data['list_sizes'])])
+                index._lists = [data['list_rows'][bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+            else:
+                index._unassigned = np.arange(index._size, dtype=np.int64)
+        return index
+
+    # ---------- internals ----------
+
+    def _append_rows(self, vectors, slot):
+        n_new = vectors.shape[0]
+        needed = self._size + n_new
+        if needed > self._vectors.shape[0]:
+            capacity = max(needed, self._vectors.shape[0] * 2, 1024)
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+            self._owner = np.resize(self._owner, capacity)
+            self._alive = np.resize(self._alive, capacity)
+        rows = np.arange(self._size, needed, dtype=np.int64)
+        self._vectors[rows] = vectors
+        self._owner[rows] = slot
+        self._alive[rows] = True
+        self._size = needed
+        return rows
+
+    def _remove_rows(self, interview_id):
+        slot = self._slot.get(interview_id)
+        if slot is not None:
+            live = self._alive[:self._size]
+            live[self._owner[:self._size] == slot] = False
+
+    def _compact(self):
+        """Drop replaced rows and re-number slots (lists must be rebuilt afterwards)"""
+        keep = np.flatnonzero(self._alive[:self._size])
+        if keep.size == self._size:
+            return
+        self._vectors = self._vectors[keep].copy()
+        self._owner = self._owner[keep].copy()
+        self._alive = np.ones(keep.size, dtype=bool)
+        self._size = keep.size
+
+        used = np.unique(self._owner)
+        remap = np.full(len(self._ids), -1, dtype=np.int64)
+        remap[used] = np.arange(used.size)
+        self._owner = remap[self._owner]
+        self._ids = [self._ids[s] for s in used]
+        self._meta = [self._meta[s] for s in used]
+        self._slot = {interview_id: slot for slot, interview_id in enumerate(self._ids)}
+
+        if self._centroids is not None:
+            assign = np.argmax(self._vectors @ self._centroids.T, axis=1) if self._size else np.zeros(0, dtype=np.int64)
+            self._lists = [np.flatnonzero(assign == i) for i in range(len(self._centroids))]
+        else:
+            self._unassigned = np.arange(self._size, dtype=np.int64)
+
+# ===========================================
+# SHARED INDEX
+# ===========================================
+
+_index = None
+_index_lock = threading.Lock()
+_maintenance_thread = None
+_last_maintenance = 0.0
+
+def _index_path():
+    return Path(os.getenv('ML_CACHE_DIR', './ml_cache')) / INDEX_FILE
+
+def _index_kwargs():
+    return {
+        'n_probe': int(os.getenv('ML_INDEX_N_PROBE', '8')),
+        'rebuild_interval_sec': int(os.getenv('ML_INDEX_REBUILD_INTERVAL', '3600'))
+    }
+
+def get_candidate_index(engine):
+    """Process-wide index; never waits on the database or k-means
+
+    The first call serves an empty placeholder (stats()['ready'] is False)
+    while the index loads in the background - from disk, else from the
+    database. After that, at most every ML_INDEX_SYNC_INTERVAL seconds a
+    call starts a background catch-up with interviews completed in other
+    workers, followed by a rebuild when the lists are stale.
+    """
+    global _index, _maintenance_thread, _last_maintenance
+    with _index_lock:
+        if _index is None:
+            _index = CandidateSkillIndex(encoder_name=engine.encoder_name, **_index_kwargs())
+            _index.ready = False
+
+        interval = float(os.getenv('ML_INDEX_SYNC_INTERVAL') or 30)
+        idle = _maintenance_thread is None or not _maintenance_thread.is_alive()
+        if idle and (not _index.ready or time.time() - _last_maintenance >= interval):
+            _last_maintenance = time.time()
+            _maintenance_thread = threading.Thread(target=_maintain_index, args=(engine,), name='candidate-index', daemon=True)
+            _maintenance_thread.start()
+        return _index
+
+def _maintain_index(engine):
+    """Background load, catch-up and rebuild for the shared index"""
+    global _index
+    try:
+        index = _index
+        if not index.ready:
+            index = _load_candidate_index(engine)
+            with _index_lock:
+                # Interviews indexed into the placeholder meanwhile are in the database; the next catch-up adds them
+                _index = index
+            return
+
+        since = index.synced_at - SYNC_OVERLAP if index.synced_at else None
+        populate_index_from_db(index, engine, since=since, skip_indexed=True)
+        if index.rebuild_if_stale():
+            save_candidate_index(index)
+    except Exception as e:
+        print(f"⚠️ Candidate index maintenance failed: {e}")
+
+def _load_candidate_index(engine):
+    """Index from disk caught up with newer interviews, else built from the database
+
+    A file built with another encoder or embedding dimension (model or
+    ML_ENCODER_BACKEND changed) is discarded and rebuilt, since its vectors
+    cannot be compared with the engine's query vectors.
+    """
+    index = None
+    path = _index_path()
+    if path.exists():
+        try:
+            index = CandidateSkillIndex.load(path, encoder_name=engine.encoder_name, dim=engine.embedding_dim, **_index_kwargs())
+        except Exception as e:
+            print(f"⚠️ Could not load candidate index, rebuilding from the database: {e}")
+
+    if index is None:
+        index = CandidateSkillIndex(encoder_name=engine.encoder_name, **_index_kwargs())
+        populate_index_from_db(index, engine)
+        index.build()
+        save_candidate_index(index)
+    else:
+        since = index.synced_at - SYNC_OVERLAP if index.synced_at else None
+        if populate_index_from_db(index, engine, since=since, skip_indexed=True) and index.rebuild_if_stale():
+            save_candidate_index(index)
+    return index
+
+def interview_skill_vectors(engine, verified_skills, skill_embeddings):
+    """One vector per verified skill (display-name form), read from the stored record"""
+    stored = engine.decode_skill_embeddings(skill_embeddings) or {}
+    names = [s.get('display_name', s.get('skill', '')) for s in verified_skills or []]
+    texts = [engine._prepare_skill_text(name) for name in names if name]
+    texts = [text for text in texts if text in stored]
+    return texts, np.array([stored[text] for text in texts], dtype=np.float32)
+
+def populate_index_from_db(index, engine, since=None, skip_indexed=False):
+    """Add completed interviews with stored skill vectors (only those completed after since); returns the count"""
+    try:
+        from models import interviews_collection
+    except Exception as e:
+        print(f"⚠️ Candidate index not populated - database unavailable: {e}")
+        return 0
+
+    query = {'status': 'completed', 'skill_embeddings': {'$exists': True}}
+    if since is not None:
+        query['completed_at'] = {'$gt': since}
+    cursor = interviews_collection.find(
+        query,
+        {'candidate_id': 1, 'completed_at': 1, 'skill_embeddings': 1, 'enhanced_skills.verified_skills': 1}
+    ).batch_size(500)
+
+    added = 0
+    for doc in cursor:
+        if skip_indexed and str(doc['_id']) in index._slot:
+            continue
+        texts, vectors = interview_skill_vectors(engine, doc.get('enhanced_skills', {}).get('verified_skills'), doc['skill_embeddings'])
+        if len(texts):
+            index.add_candidate(doc['_id'], vectors, candidate_id=doc.get('candidate_id'), skills=texts)
+            added += 1
+        completed_at = doc.get('completed_at')
+        if completed_at and (index.synced_at is None or completed_at > index.synced_at):
+            index.synced_at = completed_at
+    return added
+
+def index_interview(interview_id, candidate_id, verified_skills, skill_embeddings):
+    """Incremental insert when an interview completes (no-op until the index is first used in this process)
+
+    synced_at is left alone: it only advances from database catch-ups, so
+    interviews saved by other workers are still picked up. Rebuilds happen
+    in the background maintenance started by get_candidate_index().
+    """
+    if _index is None or not skill_embeddings:
+        return
+    from ml_similarity import get_similarity_engine
+    texts, vectors = interview_skill_vectors(get_similarity_engine(), verified_skills, skill_embeddings)
+    if len(texts):
+        _index.add_candidate(interview_id, vectors, candidate_id=candidate_id, skills=texts)
+
+def save_candidate_index(index):
+    try:
+        index.save(_index_path())
+    except Exception as e:
+        print(f"⚠️ Could not save candidate index: {e}")
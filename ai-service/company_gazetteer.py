@@ -0,0 +1,158 @@
+# company_gazetteer.py - Known-company recognition for candidate introductions
+import os
+import re
+import json
+import time
+import threading
+from collections import deque
+from pathlib import Path
+
+# ===========================================
+# GAZETTEER
+# ===========================================
+#
+# companies.json maps a sector heading to the company names recognised in
+# introductions. Every name is compiled into one Aho-Corasick automaton over
+# the lowercased names, so a text is matched against the whole gazetteer in
+# a single pass. Hits only count on whole words, like the old per-company
+# (?<!\w)name(?!\w) regexes. The file's mtime is checked at most every
+# COMPANY_GAZETTEER_CHECK_SECONDS and the automaton is rebuilt when it has
+# changed, so editing the file takes effect without a restart.
+
+DEFAULT_COMPANIES_PATH = Path(__file__).with_name("companies.json")
+
+def companies_path():
+    """COMPANY_GAZETTEER_PATH, else the bundled companies.json
+
+    Read when the gazetteer is created, not at import: interview.py imports
+    this module before load_dotenv() runs.
+    """
+    return Path(os.getenv('COMPANY_GAZETTEER_PATH') or DEFAULT_COMPANIES_PATH)
+
+_WORD_CHAR = re.compile(r'\w')
+
+class AhoCorasick:
+    """Multi-pattern string matcher; finds every occurrence of every pattern in one pass"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]      # state -> indexes of patterns ending there
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, pattern index) for every occurrence in text"""
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self.patterns
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in output[state]:
+                end = position + 1
+                yield end - len(patterns[index]), end, index
+
+class CompanyGazetteer:
+    """Known company names from a JSON file, matched as whole words in one pass"""
+
+    def __init__(self, path=None, check_interval=None):
+        self.path = Path(path or companies_path())
+        self.check_interval = float(check_interval if check_interval is not None
+                                    else os.getenv('COMPANY_GAZETTEER_CHECK_SECONDS', '5'))
+        self.names = []
+        self._matcher = (AhoCorasick([]), [])   # automaton, pattern index -> [(gazetteer order, name)]
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Rebuild the automaton from the file; keeps the previous one if the file is unreadable"""
+        with self._lock:
+            try:
+                mtime = self.path.stat().st_mtime
+                with self.path.open("r", encoding="utf-8") as f:
+                    sectors = json.load(f)
+                names = [name for sector_names in sectors.values() for name in sector_names]
+            except Exception as e:
+                print(f"[companies] Failed to load {self.path}: {e}")
+                return False
+
+            # Names differing only in case ('BrewDog', 'Brewdog') share a pattern
+            patterns = {}
+            for order, name in enumerate(names):
+                patterns.setdefault(name.lower(), []).append((order, name))
+
+            # Swapped in one assignment so concurrent find() calls see a consistent pair
+            self._matcher = (AhoCorasick(patterns), list(patterns.values()))
+            self.names = names
+            self._mtime = mtime
+            self._checked_at = time.monotonic()
+            return True
+
+    def reload_if_changed(self):
+        """Reload when the file's mtime has moved; checked at most every check_interval seconds"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime      # a broken edit is reported once, not on every check
+        return self.reload()
+
+    def find(self, text):
+        """Known companies mentioned in text, in gazetteer order"""
+        self.reload_if_changed()
+        automaton, names_by_pattern = self._matcher
+
+        text_lc = text.lower()
+        found = {}
+        for start, end, index in automaton.iter_matches(text_lc):
+            if start > 0 and _WORD_CHAR.match(text_lc[start - 1]):
+                continue
+            if end < len(text_lc) and _WORD_CHAR.match(text_lc[end]):
+                continue
+            found.update(names_by_pattern[index])
+        return [name for _, name in sorted(found.items())]
+
+    def __len__(self):
+        return len(self.names)
+
+_gazetteer = None
+
+def get_company_gazetteer():
+    """Process-wide gazetteer, loaded on first use"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = CompanyGazetteer()
+    return _gazetteer
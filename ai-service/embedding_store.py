@@ -0,0 +1,378 @@
+# embedding_store.py - Append-only persistent store for skill embeddings
+import os
+import json
+import atexit
+import threading
+import numpy as np
+from pathlib import Path
+
+try:
+    import fcntl  # POSIX only - cross-process locking for shared cache dirs
+except ImportError:
+    fcntl = None
+
+# ===========================================
+# ON-DISK LAYOUT
+# ===========================================
+#
+#   <name>.f32    raw float32 rows, one embedding per row, append-only;
+#                 opened with np.memmap so rows are read zero-copy and the
+#                 OS page cache is shared by every worker process
+#   <name>.keys   one JSON-encoded cache key per line; line i <-> row i
+#   <name>.meta   JSON with the row dimension, format version and the
+#                 caller's metadata (model name, fingerprint, created_at)
+#   <name>.lock   advisory lock taken by writers
+#
+# Writers append vectors first and keys second, each followed by fsync.
+# A row only exists once its key line is complete, so a crash mid-write
+# leaves a torn tail that readers ignore and the next writer truncates.
+# compact() rewrites both files and swaps them in with os.replace under the
+# exclusive lock. refresh() reads the keys and maps the vectors under a
+# shared lock, through handles opened together, so it never pairs the keys
+# of one generation with the vectors of another; it notices the new keys
+# file inode and re-maps from scratch.
+#
+# The file I/O and fsyncs of flush() run outside the in-memory lock, so
+# get() never waits on the disk. Lock order is always file lock, then
+# self._lock: nothing waits for the file lock while holding self._lock.
+
+STORE_FORMAT_VERSION = 1
+
+class EmbeddingStore:
+    """Append-only embedding cache on disk, shared safely between worker processes"""
+
+    def __init__(self, cache_dir, name='embeddings', read_only=False, flush_interval=2.0, metadata=None):
+        """Open (or create) the store in cache_dir; metadata is recorded in <name>.meta on creation"""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.read_only = read_only
+        self.flush_interval = flush_interval
+
+        self.vectors_path = self.cache_dir / f"{name}.f32"
+        self.keys_path = self.cache_dir / f"{name}.keys"
+        self.meta_path = self.cache_dir / f"{name}.meta"
+        self.lock_path = self.cache_dir / f"{name}.lock"
+
+        self.dim = None
+        self.metadata = dict(metadata or {})
+        self._index = {}             # key -> row in self._matrix
+        self._matrix = None          # read-only memmap over the persisted rows
+        self._keys_offset = 0        # bytes of the keys file already consumed
+        self._keys_inode = None      # changes when compact() swaps the files
+        self._pending = {}           # key -> vector, not yet written
+        self._lock = threading.RLock()
+        self._flush_lock = threading.RLock()   # one flush or compact at a time in this process
+        self._file_lock_owner = None           # thread holding the exclusive file lock
+        self._flush_timer = None
+
+        self._read_meta()
+        self.refresh()
+        atexit.register(self.close)
+
+    # ---------- dict-style access used by SkillSimilarityEngine ----------
+
+    def __contains__(self, key):
+        return key in self._pending or key in self._index
+
+    def __getitem__(self, key):
+        vector = self.get(key)
+        if vector is None:
+            raise KeyError(key)
+        return vector
+
+    def __setitem__(self, key, vector):
+        self.put(key, vector)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index) + len(self._pending)
+
+    def keys(self):
+        with self._lock:
+            return list(self._index.keys()) + list(self._pending.keys())
+
+    def get(self, key, default=None):
+        """Vector for key, or default (persisted rows are read-only memmap views)"""
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            row = self._index.get(key)
+            if row is None:
+                return default
+            return self._matrix[row]
+
+    def put(self, key, vector):
+        """Add a vector; written to disk by the next flush"""
+        if self.read_only:
+            return  # never persisted, so holding it would only grow memory
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if key in self._index:
+                return
+            if self.dim is None:
+                self.dim = int(vector.shape[0])
+            elif vector.shape[0] != self.dim:
+                raise ValueError(f"Embedding dimension {vector.shape[0]} does not match store dimension {self.dim}")
+            self._pending[key] = vector
+            flush_now = self._schedule_flush()
+        if flush_now:
+            self.flush()
+
+    @property
+    def nbytes(self):
+        """Bytes held by cached vectors (persisted + pending)"""
+        return len(self) * (self.dim or 0) * 4
+
+    # ---------- persistence ----------
+
+    def refresh(self):
+        """Pick up rows appended by other processes; returns the number of new rows"""
+        if self.dim is None:
+            with self._lock:
+                self._read_meta()
+        if self.dim is None or not self.keys_path.exists():
+            return 0
+        if self._file_lock_owner == threading.get_ident():
+            with self._lock:
+                return self._refresh_locked()
+        # Shared lock: compact() cannot swap the files while we pair them
+        with self._file_lock(shared=True), self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        """refresh() body; caller holds self._lock and a shared or exclusive file lock"""
+        if self.dim is None or not self.keys_path.exists() or not self.vectors_path.exists():
+            return 0
+        with open(self.keys_path, 'rb') as keys_file, open(self.vectors_path, 'rb') as vectors_file:
+            inode = os.fstat(keys_file.fileno()).st_ino
+            if inode != self._keys_inode:
+                if self._keys_inode is not None:
+                    # Files were compacted by another process: start over
+                    self._index = {}
+                    self._matrix = None
+                    self._keys_offset = 0
+                self._keys_inode = inode
+            keys_file.seek(self._keys_offset)
+            chunk = keys_file.read()
+
+            # Only complete lines are committed rows
+            end = chunk.rfind(b'\n') + 1
+            if end == 0:
+                return 0
+            new_keys = [json.loads(line) for line in chunk[:end].decode('utf-8').splitlines()]
+
+            first_row = 0 if self._matrix is None else self._matrix.shape[0]
+            row_bytes = self.dim * 4
+            available = os.fstat(vectors_file.fileno()).st_size // row_bytes
+            usable = min(len(new_keys), available - first_row)
+            if usable <= 0:
+                return 0
+
+            # Advance only past the key lines we could pair with vector rows
+            consumed = sum(len(line) + 1 for line in chunk[:end].split(b'\n')[:usable])
+            self._keys_offset += consumed
+
+            # Re-map the file we just measured; nothing is copied into process memory
+            self._matrix = np.memmap(vectors_file, dtype=np.float32, mode='r',
+                                     shape=(first_row + usable, self.dim))
+        for offset, key in enumerate(new_keys[:usable]):
+            self._index.setdefault(key, first_row + offset)
+            self._pending.pop(key, None)
+        return usable
+
+    def flush(self):
+        """Append pending vectors to disk; no-op when nothing changed"""
+        with self._flush_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if self.read_only or not self._pending:
+                    return 0
+
+            with self._file_lock():
+                # Another worker may have written some of the same keys
+                self.refresh()
+                with self._lock:
+                    self._truncate_torn_tail()
+                    # Snapshot only: the vectors stay in _pending (and visible to
+                    # get()) until the refresh after the write maps their rows
+                    pending = [(k, v) for k, v in self._pending.items() if k not in self._index]
+                    if not pending:
+                        return 0
+                    self._write_meta()
+
+                # Appends and fsyncs without self._lock; the exclusive file lock
+                # already keeps other writers and compaction out
+                block = np.vstack([v for _, v in pending]).astype(np.float32, copy=False)
+                with open(self.vectors_path, 'ab') as f:
+                    f.write(block.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self.keys_path, 'ab') as f:
+                    f.write(''.join(json.dumps(k) + '\n' for k, _ in pending).encode('utf-8'))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                self.refresh()
+            return len(pending)
+
+    def compact(self, keep=None):
+        """Rewrite the store without duplicate rows and keys rejected by keep(key); returns (kept, dropped)"""
+        if self.read_only:
+            raise ValueError("Cannot compact a read-only embedding store")
+        with self._flush_lock:
+            self.flush()
+            with self._file_lock(), self._lock:
+                self.refresh()
+                total = self._matrix.shape[0] if self._matrix is not None else 0
+                # _index maps each key to its first row, so later duplicates fall away
+                kept = [(key, row) for key, row in self._index.items() if keep is None or keep(key)]
+                if len(kept) == total:
+                    return len(kept), 0
+
+                tmp_vectors = self.vectors_path.with_name(self.vectors_path.name + '.tmp')
+                tmp_keys = self.keys_path.with_name(self.keys_path.name + '.tmp')
+                rows = np.array([row for _, row in kept], dtype=np.int64)
+                with open(tmp_vectors, 'wb') as f:
+                    if rows.size:
+                        f.write(np.ascontiguousarray(self._matrix[rows]).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(tmp_keys, 'wb') as f:
+                    f.write(''.join(json.dumps(key) + '\n' for key, _ in kept).encode('utf-8'))
+                    f.flush()
+                    os.fsync(f.fileno())
+                # Readers take the shared lock before pairing keys with vectors,
+                # so neither swap is visible to them until both are done
+                os.replace(tmp_vectors, self.vectors_path)
+                os.replace(tmp_keys, self.keys_path)
+                self.refresh()
+                return len(kept), total - len(kept)
+
+    def drop(self):
+        """Delete the store's files"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending.clear()
+            self._index = {}
+            self._matrix = None
+            self._keys_offset = 0
+            self._keys_inode = None
+            self.dim = None
+            for path in (self.vectors_path, self.keys_path, self.meta_path):
+                if path.exists():
+                    path.unlink()
+
+    def close(self):
+        """Flush outstanding writes"""
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Warning: Could not flush embedding store: {e}")
+
+    def stats(self):
+        """Store statistics"""
+        return {
+            'persisted_embeddings': len(self._index),
+            'pending_embeddings': len(self._pending),
+            'dimension': self.dim,
+            'model': self.metadata.get('model'),
+            'created_at': self.metadata.get('created_at'),
+            'disk_size_mb': round(sum(p.stat().st_size for p in (self.vectors_path, self.keys_path) if p.exists()) / (1024 * 1024), 4),
+            'read_only': self.read_only
+        }
+
+    # ---------- internals ----------
+
+    def _schedule_flush(self):
+        """Flush in the background shortly after the first unsaved write (caller holds self._lock)
+
+        Returns True when flushing is synchronous (no flush_interval); the
+        caller then flushes after releasing self._lock.
+        """
+        if self.read_only or self._flush_timer is not None:
+            return False
+        if not self.flush_interval or self.flush_interval <= 0:
+            return True
+        self._flush_timer = threading.Timer(self.flush_interval, self.close)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+        return False
+
+    def _truncate_torn_tail(self):
+        """Drop half-written rows/keys left behind by a crashed writer (caller holds the file lock and self._lock)"""
+        rows = self._matrix.shape[0] if self._matrix is not None else 0
+        row_bytes = (self.dim or 0) * 4
+        if self.vectors_path.exists() and row_bytes and self.vectors_path.stat().st_size != rows * row_bytes:
+            os.truncate(self.vectors_path, rows * row_bytes)
+        if self.keys_path.exists() and self.keys_path.stat().st_size != self._keys_offset:
+            os.truncate(self.keys_path, self._keys_offset)
+
+    def _read_meta(self):
+        if self.meta_path.exists():
+            try:
+                meta = json.loads(self.meta_path.read_text())
+                self.dim = int(meta['dim'])
+                self.metadata = meta.get('metadata', self.metadata)
+            except Exception as e:
+                print(f"Warning: Could not read embedding store metadata: {e}")
+
+    def _write_meta(self):
+        if self.meta_path.exists():
+            return
+        tmp_path = self.meta_path.with_suffix('.meta.tmp')
+        tmp_path.write_text(json.dumps({
+            'dim': self.dim,
+            'dtype': 'float32',
+            'format': STORE_FORMAT_VERSION,
+            'metadata': self.metadata
+        }))
+        os.replace(tmp_path, self.meta_path)
+
+    def _file_lock(self, shared=False):
+        return _FileLock(self.lock_path, shared=shared, owner=None if shared else self)
+
+class _FileLock:
+    """Exclusive or shared advisory lock on a file (no-op where fcntl is unavailable)
+
+    A shared lock on a read-only cache dir without a lock file cannot be
+    taken; readers then go without, as no writer can be compacting there.
+    """
+
+    def __init__(self, path, shared=False, owner=None):
+        self.path = path
+        self.shared = shared
+        self.owner = owner       # store whose _file_lock_owner records an exclusive hold
+        self._fh = None
+        self._previous_owner = None
+
+    def __enter__(self):
+        try:
+            self._fh = open(self.path, 'a+')
+        except OSError:
+            if not self.shared:
+                raise
+            try:
+                self._fh = open(self.path, 'r')
+            except OSError:
+                self._fh = None
+        if fcntl is not None and self._fh is not None:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        if self.owner is not None:
+            self._previous_owner = self.owner._file_lock_owner
+            self.owner._file_lock_owner = threading.get_ident()
+        return self
+
+    def __exit__(self, *exc):
+        if self.owner is not None:
+            self.owner._file_lock_owner = self._previous_owner
+        if self._fh is not None:
+            if fcntl is not None:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            self._fh.close()
+            self._fh = None
+        return False
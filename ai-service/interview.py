@@ -8,8 +8,11 @@ import statistics
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Tuple
 import re
+from company_gazetteer import get_company_gazetteer
+from skill_canonicaliser import get_canonicaliser
 
 load_dotenv()
 
@@ -156,6 +159,90 @@ def _compile_for_check(pat: str):
     words = re.split(r'\s+', pat.strip())
     return re.compile(r'(?<!\w)' + r'\s+'.join(map(re.escape, words)) + r'(?!\w)', re.IGNORECASE)
 
+# ===========================================
+# SINGLE-PASS TOOL EXTRACTION
+# ===========================================
+
+class ToolMatcher:
+    """Finds every TOOL_PATTERNS tool mentioned in a text with one precompiled scan
+
+    The text is tokenised once; only words that start some literal variant
+    are tried, against a precompiled alternation of just the variants that
+    start with that word (longest first). When a long variant matches
+    ('linkedin sales navigator') every shorter variant that is a whole-word
+    prefix of it ('linkedin') matches at the same spot too, so each
+    alternative carries the tools it implies. The few regex variants are
+    compiled once and searched separately. Results are identical to checking
+    each pattern with _compile_for_check.
+    """
+
+    WORD = re.compile(r'\w+')
+
+    def __init__(self, tool_patterns):
+        self.tool_names = list(tool_patterns)
+        literals = {}            # normalised variant -> tool names
+        self.regex_variants = []
+        for tool_name, patterns in tool_patterns.items():
+            for pat in patterns:
+                if any(ch in pat for ch in r'[](){}?+*|\\'):
+                    self.regex_variants.append((tool_name, re.compile(pat, re.IGNORECASE)))
+                else:
+                    variant = ' '.join(re.split(r'\s+', pat.strip())).lower()
+                    literals.setdefault(variant, []).append(tool_name)
+
+        by_first_word = {}       # first word of the variant -> variants
+        for variant in literals:
+            first = self.WORD.match(variant)
+            by_first_word.setdefault(first.group() if first else '', []).append(variant)
+
+        # first word -> (alternation anchored at that word, tools implied per group)
+        self._scanners = {}
+        for first, variants in by_first_word.items():
+            variants.sort(key=len, reverse=True)
+            group_tools = [None]
+            for variant in variants:
+                implied = set()
+                for other in variants:
+                    if variant.startswith(other) and (len(other) == len(variant) or not re.match(r'\w', variant[len(other)])):
+                        implied.update(literals[other])
+                group_tools.append(implied)
+            alternatives = '|'.join('(' + r'\s+'.join(map(re.escape, v.split(' '))) + ')' for v in variants)
+            self._scanners[first] = (re.compile(r'(?:' + alternatives + r')(?!\w)', re.IGNORECASE), group_tools)
+
+        # Variants that start with punctuation ('.net') cannot be keyed by a word
+        self._unkeyed = self._scanners.pop('', None)
+        if self._unkeyed:
+            rx, group_tools = self._unkeyed
+            self._unkeyed = (re.compile(r'(?<!\w)(?=' + rx.pattern + ')', re.IGNORECASE), group_tools)
+
+    def find(self, text):
+        """Display names of the tools in text, in TOOL_PATTERNS order"""
+        found = set()
+        scanners = self._scanners
+        for word in self.WORD.finditer(text):
+            scanner = scanners.get(word.group().lower())
+            if scanner is not None:
+                match = scanner[0].match(text, word.start())
+                if match:
+                    found.update(scanner[1][match.lastindex])
+        if self._unkeyed:
+            rx, group_tools = self._unkeyed
+            for match in rx.finditer(text):
+                found.update(group_tools[match.lastindex])
+        for tool_name, rx in self.regex_variants:
+            if tool_name not in found and rx.search(text):
+                found.add(tool_name)
+
+        tools = []
+        for tool_name in self.tool_names:
+            if tool_name in found:
+                display_name = tool_name.replace('_', ' ').title()
+                if display_name not in tools:
+                    tools.append(display_name)
+        return tools
+
+TOOL_MATCHER = ToolMatcher(TOOL_PATTERNS)
+
 # ===========================================
 # QUESTION TRACKER CLASS
 # ===========================================
@@ -222,163 +309,147 @@ class QuestionTracker:
 # ENHANCED DATA QUALITY VALIDATION - ALL 14 ROLES
 # ===========================================
 
+ROLE_SKILLS = {
+    "data_analyst": {
+        "programming_languages": ["python", "r", "sql", "javascript", "matlab"],
+        "tools": ["excel", "power bi", "tableau", "jupyter", "git", "spss", "google analytics"],
+        "databases": ["mysql", "postgresql", "mongodb", "sqlite", "oracle"],
+        "frameworks": ["pandas", "numpy", "scikit-learn", "matplotlib", "seaborn"],
+        "concepts": ["statistics", "machine learning", "data visualization", "etl", "reporting", "forecasting"]
+    },
+    "business_analyst": {
+        "programming_languages": ["sql", "python", "r"],
+        "tools": ["visio", "jira", "confluence", "excel", "powerpoint", "sharepoint", "lucidchart"],
+        "databases": ["mysql", "postgresql", "oracle", "sql server"],
+        "frameworks": ["agile", "scrum", "waterfall", "lean"],
+        "concepts": ["requirements analysis", "process mapping", "stakeholder management", "gap analysis", "change management"]
+    },
+    "financial_analyst": {
+        "programming_languages": ["sql", "python", "vba"],
+        "tools": ["excel", "bloomberg", "sap", "tableau", "power bi", "quickbooks"],
+        "databases": ["sql server", "oracle", "mysql"],
+        "frameworks": ["gaap", "ifrs", "sox"],
+        "concepts": ["financial modeling", "forecasting", "budgeting", "variance analysis", "valuation", "dcf"]
+    },
+    "data_engineer": {
+        "programming_languages": ["python", "java", "scala", "sql", "go"],
+        "tools": ["airflow", "databricks", "snowflake", "jenkins", "git", "docker"],
+        "databases": ["postgresql", "mongodb", "cassandra", "redis", "elasticsearch"],
+        "frameworks": ["apache spark", "kafka", "hadoop", "kubernetes"],
+        "concepts": ["etl", "data pipeline", "real-time processing", "data warehousing", "streaming"]
+    },
+    "data_scientist": {
+        "programming_languages": ["python", "r", "sql", "julia"],
+        "tools": ["jupyter", "tensorflow", "pytorch", "mlflow", "docker", "git"],
+        "databases": ["postgresql", "mongodb", "redis", "bigquery"],
+        "frameworks": ["scikit-learn", "pandas", "numpy", "keras", "xgboost"],
+        "concepts": ["machine learning", "deep learning", "statistics", "feature engineering", "model deployment"]
+    },
+    "software_developer": {
+        "programming_languages": ["python", "javascript", "java", "c++", "typescript", "go", "rust"],
+        "tools": ["git", "docker", "kubernetes", "jenkins", "postman", "vs code"],
+        "databases": ["mysql", "postgresql", "mongodb", "redis", "elasticsearch"],
+        "frameworks": ["react", "angular", "vue", "django", "flask", "spring", "express"],
+        "concepts": ["algorithms", "data structures", "system design", "testing", "debugging", "api design"]
+    },
+    "frontend_developer": {
+        "programming_languages": ["javascript", "typescript", "html", "css", "sass"],
+        "tools": ["vs code", "webpack", "git", "chrome devtools", "figma", "jest"],
+        "databases": ["localstorage", "indexeddb", "firebase"],
+        "frameworks": ["react", "angular", "vue", "redux", "next.js", "gatsby"],
+        "concepts": ["responsive design", "user experience", "performance optimization", "accessibility", "seo"]
+    },
+    "backend_developer": {
+        "programming_languages": ["python", "java", "node.js", "go", "c#", "php"],
+        "tools": ["docker", "kubernetes", "jenkins", "postman", "git"],
+        "databases": ["postgresql", "mysql", "mongodb", "redis", "cassandra"],
+        "frameworks": ["django", "flask", "spring", "express", "fastapi"],
+        "concepts": ["api design", "database design", "system architecture", "security", "microservices"]
+    },
+    "project_manager": {
+        "programming_languages": [],
+        "tools": ["jira", "asana", "microsoft project", "slack", "confluence", "excel", "trello"],
+        "databases": [],
+        "frameworks": ["agile", "scrum", "waterfall", "kanban", "lean"],
+        "concepts": ["project planning", "risk management", "stakeholder communication", "budget management", "team leadership"]
+    },
+    "technical_project_manager": {
+        "programming_languages": ["sql", "python"],
+        "tools": ["jira", "git", "docker", "jenkins", "slack", "confluence", "postman"],
+        "databases": ["mysql", "postgresql", "mongodb"],
+        "frameworks": ["agile", "scrum", "devops", "ci/cd"],
+        "concepts": ["technical architecture", "software development lifecycle", "api management", "system integration"]
+    },
+    "sales_manager": {
+        "programming_languages": [],
+        "tools": ["salesforce", "hubspot", "excel", "linkedin sales navigator", "zoom", "slack"],
+        "databases": [],
+        "frameworks": ["crm", "sales methodology", "lead scoring"],
+        "concepts": ["team leadership", "sales strategy", "performance management", "customer relations", "territory management"]
+    },
+    "retail_store_manager": {
+        "programming_languages": [],
+        "tools": ["pos systems", "inventory management", "excel", "scheduling software", "social media"],
+        "databases": [],
+        "frameworks": ["retail operations", "customer service", "inventory control"],
+        "concepts": ["team management", "inventory management", "customer service", "sales management", "visual merchandising"]
+    },
+    "mechanical_engineer": {
+        "programming_languages": ["matlab", "python", "c++"],
+        "tools": ["solidworks", "autocad", "ansys", "3d printing", "cnc programming", "excel"],
+        "databases": [],
+        "frameworks": ["lean manufacturing", "six sigma", "fea"],
+        "concepts": ["cad design", "materials science", "thermodynamics", "manufacturing processes", "quality control"]
+    },
+    "design_technician": {
+        "programming_languages": [],
+        "tools": ["autocad", "solidworks", "inventor", "drafting tools", "3d modeling", "plm software"],
+        "databases": [],
+        "frameworks": ["technical drawing standards", "gd&t"],
+        "concepts": ["technical drawing", "blueprint reading", "geometric dimensioning", "manufacturing knowledge", "documentation"]
+    },
+    "customer_care_representative": {
+        "programming_languages": [],
+        "tools": ["crm systems", "help desk software", "chat platforms", "phone systems", "ticketing systems"],
+        "databases": [],
+        "frameworks": ["customer service", "conflict resolution"],
+        "concepts": ["communication", "problem solving", "empathy", "product knowledge", "multi-tasking"]
+    },
+    "sales_executive": {
+        "programming_languages": [],
+        "tools": ["salesforce", "linkedin sales navigator", "crm", "email marketing", "zoom", "powerpoint"],
+        "databases": [],
+        "frameworks": ["sales process", "crm", "lead generation"],
+        "concepts": ["prospecting", "relationship building", "negotiation", "product knowledge", "presentation skills"]
+    }
+}
+
+def _build_skill_taxonomy(role_skills):
+    """skill -> {role: category}, frozen; a skill listed twice for a role keeps its first category"""
+    taxonomy = {}
+    for role_key, categories in role_skills.items():
+        for category, skills in categories.items():
+            for skill in skills:
+                taxonomy.setdefault(skill, {}).setdefault(role_key, category)
+    return MappingProxyType({skill: MappingProxyType(roles) for skill, roles in taxonomy.items()})
+
+SKILL_TAXONOMY = _build_skill_taxonomy(ROLE_SKILLS)
+
 def validate_skill_name(skill_name, role="Data Analyst"):
     """Validate and filter skills based on role relevance - Updated for all 14 roles"""
-    
-    ROLE_SKILLS = {
-        "data_analyst": {
-            "programming_languages": ["python", "r", "sql", "javascript", "matlab"],
-            "tools": ["excel", "power bi", "tableau", "jupyter", "git", "spss", "google analytics"],
-            "databases": ["mysql", "postgresql", "mongodb", "sqlite", "oracle"],
-            "frameworks": ["pandas", "numpy", "scikit-learn", "matplotlib", "seaborn"],
-            "concepts": ["statistics", "machine learning", "data visualization", "etl", "reporting", "forecasting"]
-        },
-        "business_analyst": {
-            "programming_languages": ["sql", "python", "r"],
-            "tools": ["visio", "jira", "confluence", "excel", "powerpoint", "sharepoint", "lucidchart"],
-            "databases": ["mysql", "postgresql", "oracle", "sql server"],
-            "frameworks": ["agile", "scrum", "waterfall", "lean"],
-            "concepts": ["requirements analysis", "process mapping", "stakeholder management", "gap analysis", "change management"]
-        },
-        "financial_analyst": {
-            "programming_languages": ["sql", "python", "vba"],
-            "tools": ["excel", "bloomberg", "sap", "tableau", "power bi", "quickbooks"],
-            "databases": ["sql server", "oracle", "mysql"],
-            "frameworks": ["gaap", "ifrs", "sox"],
-            "concepts": ["financial modeling", "forecasting", "budgeting", "variance analysis", "valuation", "dcf"]
-        },
-        "data_engineer": {
-            "programming_languages": ["python", "java", "scala", "sql", "go"],
-            "tools": ["airflow", "databricks", "snowflake", "jenkins", "git", "docker"],
-            "databases": ["postgresql", "mongodb", "cassandra", "redis", "elasticsearch"],
-            "frameworks": ["apache spark", "kafka", "hadoop", "kubernetes"],
-            "concepts": ["etl", "data pipeline", "real-time processing", "data warehousing", "streaming"]
-        },
-        "data_scientist": {
-            "programming_languages": ["python", "r", "sql", "julia"],
-            "tools": ["jupyter", "tensorflow", "pytorch", "mlflow", "docker", "git"],
-            "databases": ["postgresql", "mongodb", "redis", "bigquery"],
-            "frameworks": ["scikit-learn", "pandas", "numpy", "keras", "xgboost"],
-            "concepts": ["machine learning", "deep learning", "statistics", "feature engineering", "model deployment"]
-        },
-        "software_developer": {
-            "programming_languages": ["python", "javascript", "java", "c++", "typescript", "go", "rust"],
-            "tools": ["git", "docker", "kubernetes", "jenkins", "postman", "vs code"],
-            "databases": ["mysql", "postgresql", "mongodb", "redis", "elasticsearch"],
-            "frameworks": ["react", "angular", "vue", "django", "flask", "spring", "express"],
-            "concepts": ["algorithms", "data structures", "system design", "testing", "debugging", "api design"]
-        },
-        "frontend_developer": {
-            "programming_languages": ["javascript", "typescript", "html", "css", "sass"],
-            "tools": ["vs code", "webpack", "git", "chrome devtools", "figma", "jest"],
-            "databases": ["localstorage", "indexeddb", "firebase"],
-            "frameworks": ["react", "angular", "vue", "redux", "next.js", "gatsby"],
-            "concepts": ["responsive design", "user experience", "performance optimization", "accessibility", "seo"]
-        },
-        "backend_developer": {
-            "programming_languages": ["python", "java", "node.js", "go", "c#", "php"],
-            "tools": ["docker", "kubernetes", "jenkins", "postman", "git"],
-            "databases": ["postgresql", "mysql", "mongodb", "redis", "cassandra"],
-            "frameworks": ["django", "flask", "spring", "express", "fastapi"],
-            "concepts": ["api design", "database design", "system architecture", "security", "microservices"]
-        },
-        "project_manager": {
-            "programming_languages": [],
-            "tools": ["jira", "asana", "microsoft project", "slack", "confluence", "excel", "trello"],
-            "databases": [],
-            "frameworks": ["agile", "scrum", "waterfall", "kanban", "lean"],
-            "concepts": ["project planning", "risk management", "stakeholder communication", "budget management", "team leadership"]
-        },
-        "technical_project_manager": {
-            "programming_languages": ["sql", "python"],
-            "tools": ["jira", "git", "docker", "jenkins", "slack", "confluence", "postman"],
-            "databases": ["mysql", "postgresql", "mongodb"],
-            "frameworks": ["agile", "scrum", "devops", "ci/cd"],
-            "concepts": ["technical architecture", "software development lifecycle", "api management", "system integration"]
-        },
-        "sales_manager": {
-            "programming_languages": [],
-            "tools": ["salesforce", "hubspot", "excel", "linkedin sales navigator", "zoom", "slack"],
-            "databases": [],
-            "frameworks": ["crm", "sales methodology", "lead scoring"],
-            "concepts": ["team leadership", "sales strategy", "performance management", "customer relations", "territory management"]
-        },
-        "retail_store_manager": {
-            "programming_languages": [],
-            "tools": ["pos systems", "inventory management", "excel", "scheduling software", "social media"],
-            "databases": [],
-            "frameworks": ["retail operations", "customer service", "inventory control"],
-            "concepts": ["team management", "inventory management", "customer service", "sales management", "visual merchandising"]
-        },
-        "mechanical_engineer": {
-            "programming_languages": ["matlab", "python", "c++"],
-            "tools": ["solidworks", "autocad", "ansys", "3d printing", "cnc programming", "excel"],
-            "databases": [],
-            "frameworks": ["lean manufacturing", "six sigma", "fea"],
-            "concepts": ["cad design", "materials science", "thermodynamics", "manufacturing processes", "quality control"]
-        },
-        "design_technician": {
-            "programming_languages": [],
-            "tools": ["autocad", "solidworks", "inventor", "drafting tools", "3d modeling", "plm software"],
-            "databases": [],
-            "frameworks": ["technical drawing standards", "gd&t"],
-            "concepts": ["technical drawing", "blueprint reading", "geometric dimensioning", "manufacturing knowledge", "documentation"]
-        },
-        "customer_care_representative": {
-            "programming_languages": [],
-            "tools": ["crm systems", "help desk software", "chat platforms", "phone systems", "ticketing systems"],
-            "databases": [],
-            "frameworks": ["customer service", "conflict resolution"],
-            "concepts": ["communication", "problem solving", "empathy", "product knowledge", "multi-tasking"]
-        },
-        "sales_executive": {
-            "programming_languages": [],
-            "tools": ["salesforce", "linkedin sales navigator", "crm", "email marketing", "zoom", "powerpoint"],
-            "databases": [],
-            "frameworks": ["sales process", "crm", "lead generation"],
-            "concepts": ["prospecting", "relationship building", "negotiation", "product knowledge", "presentation skills"]
-        }
-    }
-    
     role_key = role.lower().replace(" ", "_").replace("-", "_")
+    if role_key not in ROLE_SKILLS:
+        role_key = "data_analyst"
     
-    role_mappings = {
-        "data_analyst": "data_analyst",
-        "business_analyst": "business_analyst", 
-        "financial_analyst": "financial_analyst",
-        "data_engineer": "data_engineer",
-        "data_scientist": "data_scientist",
-        "software_developer": "software_developer",
-        "frontend_developer": "frontend_developer",
-        "backend_developer": "backend_developer",
-        "project_manager": "project_manager",
-        "technical_project_manager": "technical_project_manager",
-        "sales_manager": "sales_manager",
-        "retail_store_manager": "retail_store_manager",
-        "mechanical_engineer": "mechanical_engineer",
-        "design_technician": "design_technician",
-        "customer_care_representative": "customer_care_representative",
-        "sales_executive": "sales_executive"
-    }
-    
-    role_key = role_mappings.get(role_key, "data_analyst")
-    
-    skill_lower = skill_name.lower().strip()
-    role_skills = ROLE_SKILLS.get(role_key, ROLE_SKILLS["data_analyst"])
-    
-    for category, skills in role_skills.items():
-        if skill_lower in skills:
-            return True, category
+    category = SKILL_TAXONOMY.get(skill_name.lower().strip(), {}).get(role_key)
+    if category is not None:
+        return True, category
     
     return False, "unknown"
     
 def normalize_skill(skill_name):
     """Normalize skill using TOOL_PATTERNS mapping"""
-    skill_lower = skill_name.lower().strip()
-    for standard_name, variants in TOOL_PATTERNS.items():
-        if skill_lower in variants:
-            return standard_name
-    return skill_lower
+    return get_canonicaliser(TOOL_PATTERNS).canonical(skill_name)
 
 def clean_skill_data(skill_ratings, role="Data Analyst"):
     """Clean and validate skill ratings data"""
@@ -546,287 +617,73 @@ def evaluate_answer_with_consensus(answer, question_data, time_taken_sec=0):
     except Exception as e:
         print(f"Consensus scoring error: {e}")
         return get_fallback_scores(answer, question_data, quality_flags)
+RUBRICS_PATH = Path(__file__).with_name("rubrics.json")
+
+# Used for roles without a rubric library, and if rubrics.json cannot be read
+UNIVERSAL_DEFAULT_RUBRIC = {
+    "expected_points": [
+        "Provide clear context and objective",
+        "Explain methodology or approach used",
+        "Share specific outcomes or metrics",
+        "Reflect on impact or learnings"
+    ],
+    "keywords": ["context", "approach", "outcome", "learned"],
+    "common_mistakes": ["Too abstract", "Missing specifics"]
+}
+
+_rubric_library = None
+
+def load_rubric_library():
+    """Role rubrics from rubrics.json with a keyword index per role, loaded once
+
+    Each role maps to (scanner, rubric per scanner group, role default). The
+    scanner is one lookahead alternation with a group per rubric, in file
+    order, so a single pass over the question reports, at every position
+    where some keyword occurs, the earliest rubric with a keyword there.
+    """
+    global _rubric_library
+    if _rubric_library is None:
+        try:
+            with RUBRICS_PATH.open("r", encoding="utf-8") as f:
+                rubrics = json.load(f)
+        except Exception as e:
+            print(f"[rubrics] Failed to load rubrics.json: {e} -- path={RUBRICS_PATH.resolve()}")
+            rubrics = {}
+        
+        library = {}
+        for role_key, role_rubrics in rubrics.items():
+            typed = [rubric for rubric_type, rubric in role_rubrics.items()
+                     if rubric_type != "default" and rubric.get("keywords")]
+            alternatives = '|'.join('(' + '|'.join(map(re.escape, rubric["keywords"])) + ')' for rubric in typed)
+            scanner = re.compile('(?=(?:' + alternatives + '))') if typed else None
+            library[role_key] = (scanner, [None] + typed, role_rubrics.get("default", UNIVERSAL_DEFAULT_RUBRIC))
+        _rubric_library = library
+    return _rubric_library
+
 def get_default_rubric(question_text: str, role: str, skill_focus: str = ""):
-    """Get role-appropriate rubric based on question content"""
+    """Get role-appropriate rubric based on question content (shared dicts - do not mutate)"""
     q_lower = (question_text or "").lower()
     
-    # Role-specific rubric libraries
-    RUBRICS = {
-        "data_analyst": {
-            "data_investigation": {
-                "keywords": ["drop", "metric", "investigate", "analyze", "performance"],
-                "expected_points": [
-                    "Define what metrics dropped and by how much",
-                    "Identify potential root causes to investigate",
-                    "Explain data analysis approach (segmentation, trends, anomalies)",
-                    "Describe validation and hypothesis testing",
-                    "Share actionable insights or recommendations"
-                ],
-                "keywords": ["metric", "segmentation", "trend", "hypothesis", "root cause"],
-                "common_mistakes": ["No systematic approach", "Missing validation steps", "No actionable recommendations"]
-            },
-            "data_cleaning": {
-                "keywords": ["clean", "validate", "messy", "quality"],
-                "expected_points": [
-                    "Identify data quality issues (missing, duplicates, outliers)",
-                    "Explain cleaning methodology",
-                    "Describe validation approach",
-                    "Share impact on analysis quality"
-                ],
-                "keywords": ["missing data", "outliers", "validation", "quality checks"],
-                "common_mistakes": ["No documentation", "No validation", "Deleting data without investigation"]
-            },
-            "visualization": {
-                "keywords": ["dashboard", "visualization", "chart", "report"],
-                "expected_points": [
-                    "Define audience and their needs",
-                    "Explain chart/visual choices",
-                    "Describe interactivity or filters",
-                    "Share business impact or adoption"
-                ],
-                "keywords": ["audience", "interactive", "kpi", "insight"],
-                "common_mistakes": ["Wrong chart type", "No context", "Too complex"]
-            },
-            "default": {
-                "expected_points": [
-                    "Clearly define the analytical objective",
-                    "Explain data sources and methodology",
-                    "Share findings with metrics",
-                    "Discuss business impact or recommendations"
-                ],
-                "keywords": ["analysis", "data", "insight", "recommendation"],
-                "common_mistakes": ["Too vague", "No metrics", "Missing business context"]
-            }
-        },
-        
-        "data_scientist": {
-            "model_building": {
-                "keywords": ["machine learning", "model", "built", "trained"],
-                "expected_points": [
-                    "Define problem and success metrics",
-                    "Describe dataset and features",
-                    "Explain algorithm selection and training",
-                    "Present results with performance metrics",
-                    "Discuss business impact"
-                ],
-                "keywords": ["algorithm", "features", "accuracy", "precision", "recall", "impact"],
-                "common_mistakes": ["No metrics", "No business impact", "Overfitting not addressed"]
-            },
-            "feature_engineering": {
-                "keywords": ["feature", "engineering", "selection"],
-                "expected_points": [
-                    "Explain exploratory analysis approach",
-                    "Describe feature creation techniques",
-                    "Discuss selection methodology",
-                    "Share impact on model performance"
-                ],
-                "keywords": ["eda", "encoding", "scaling", "selection", "importance"],
-                "common_mistakes": ["No leakage prevention", "No selection rationale"]
-            },
-            "imbalanced_data": {
-                "keywords": ["imbalanced", "class", "rare"],
-                "expected_points": [
-                    "Recognize metrics beyond accuracy",
-                    "Explain resampling or weighting approach",
-                    "Describe validation strategy",
-                    "Share results and trade-offs"
-                ],
-                "keywords": ["precision", "recall", "f1", "smote", "class weights"],
-                "common_mistakes": ["Using accuracy only", "No stratification"]
-            },
-            "model_debugging": {
-                "keywords": ["poorly", "debug", "drift", "failed"],
-                "expected_points": [
-                    "Identify root cause (data drift, pipeline, model)",
-                    "Explain diagnostic process",
-                    "Describe solution implemented",
-                    "Share monitoring or prevention measures"
-                ],
-                "keywords": ["drift", "monitoring", "retrain", "validation"],
-                "common_mistakes": ["No systematic debugging", "No monitoring plan"]
-            },
-            "default": {
-                "expected_points": [
-                    "Define the ML problem clearly",
-                    "Explain methodology and algorithms",
-                    "Present quantitative results",
-                    "Discuss deployment or business value"
-                ],
-                "keywords": ["model", "data", "performance", "production"],
-                "common_mistakes": ["No metrics", "Missing production considerations"]
-            }
-        },
-        
-        "business_analyst": {
-            "requirements_gathering": {
-                "keywords": ["requirements", "stakeholder", "gather", "elicit"],
-                "expected_points": [
-                    "Identify stakeholder groups",
-                    "Explain elicitation techniques used",
-                    "Describe conflict resolution approach",
-                    "Share documentation method",
-                    "Discuss validation and approval"
-                ],
-                "keywords": ["stakeholder", "workshop", "documentation", "validation"],
-                "common_mistakes": ["Missing stakeholders", "No prioritization", "Poor documentation"]
-            },
-            "process_improvement": {
-                "keywords": ["process", "improvement", "efficiency", "optimize"],
-                "expected_points": [
-                    "Map current process and identify pain points",
-                    "Define improvement objectives",
-                    "Explain solution designed",
-                    "Share implementation approach",
-                    "Present measurable results"
-                ],
-                "keywords": ["mapping", "bottleneck", "optimization", "roi"],
-                "common_mistakes": ["No baseline metrics", "Missing change management"]
-            },
-            "gap_analysis": {
-                "keywords": ["gap", "analysis", "current", "future"],
-                "expected_points": [
-                    "Define current state assessment",
-                    "Describe desired future state",
-                    "Identify gaps and priorities",
-                    "Recommend action plan"
-                ],
-                "keywords": ["assessment", "gap", "priority", "roadmap"],
-                "common_mistakes": ["No prioritization", "Unrealistic timeline"]
-            },
-            "default": {
-                "expected_points": [
-                    "Define business problem or opportunity",
-                    "Explain analysis methodology",
-                    "Present findings and recommendations",
-                    "Discuss implementation approach"
-                ],
-                "keywords": ["business", "analysis", "recommendation", "stakeholder"],
-                "common_mistakes": ["No business context", "Missing implementation details"]
-            }
-        },
-        
-        "design_technician": {
-            "cad_drawing": {
-                "keywords": ["autocad", "solidworks", "drawing", "design", "revit"],
-                "expected_points": [
-                    "Explain project requirements and constraints",
-                    "Describe CAD tools and techniques used",
-                    "Discuss standards compliance (ISO, GD&T)",
-                    "Share quality assurance process",
-                    "Mention collaboration with engineers/manufacturing"
-                ],
-                "keywords": ["specifications", "standards", "tolerances", "review", "manufacturing"],
-                "common_mistakes": ["Missing standards", "No QA checks", "Poor documentation"]
-            },
-            "design_changes": {
-                "keywords": ["change", "revision", "update", "modify"],
-                "expected_points": [
-                    "Explain reason for change",
-                    "Describe impact analysis on related drawings",
-                    "Detail version control approach",
-                    "Share communication with team",
-                    "Discuss validation process"
-                ],
-                "keywords": ["revision", "impact", "coordination", "validation"],
-                "common_mistakes": ["No impact assessment", "Poor communication"]
-            },
-            "manufacturing_issues": {
-                "keywords": ["manufacturing", "production", "issue", "problem"],
-                "expected_points": [
-                    "Identify the manufacturing issue",
-                    "Explain root cause analysis",
-                    "Describe drawing corrections made",
-                    "Share preventive measures",
-                    "Discuss lessons learned"
-                ],
-                "keywords": ["tolerance", "clarification", "correction", "prevention"],
-                "common_mistakes": ["Blaming others", "No preventive action"]
-            },
-            "default": {
-                "expected_points": [
-                    "Describe technical requirements",
-                    "Explain design methodology",
-                    "Discuss quality and standards compliance",
-                    "Share collaboration approach"
-                ],
-                "keywords": ["technical", "standards", "accuracy", "team"],
-                "common_mistakes": ["Lacking technical detail", "No quality measures"]
-            }
-        },
-        
-        "sales_manager": {
-            "team_management": {
-                "keywords": ["team", "motivate", "underperform", "manage", "coach"],
-                "expected_points": [
-                    "Describe specific team situation",
-                    "Explain diagnostic approach",
-                    "Detail coaching or intervention actions",
-                    "Share measurable results",
-                    "Discuss ongoing support or changes"
-                ],
-                "keywords": ["coaching", "performance", "metrics", "improvement"],
-                "common_mistakes": ["Generic advice", "No metrics", "No follow-up plan"]
-            },
-            "deal_management": {
-                "keywords": ["deal", "close", "negotiation", "objection"],
-                "expected_points": [
-                    "Set context (deal size, complexity, timeline)",
-                    "Identify key challenges or objections",
-                    "Explain strategy and tactics used",
-                    "Share outcome and lessons learned"
-                ],
-                "keywords": ["strategy", "objection handling", "value proposition", "outcome"],
-                "common_mistakes": ["No preparation mentioned", "Missing lessons learned"]
-            },
-            "sales_strategy": {
-                "keywords": ["strategy", "target", "territory", "forecast"],
-                "expected_points": [
-                    "Define market or territory analysis",
-                    "Explain strategy development",
-                    "Detail implementation plan",
-                    "Share results vs targets"
-                ],
-                "keywords": ["analysis", "plan", "execution", "results"],
-                "common_mistakes": ["No data backing", "Missing execution details"]
-            },
-            "default": {
-                "expected_points": [
-                    "Provide specific situation context",
-                    "Explain approach and actions taken",
-                    "Share measurable results",
-                    "Discuss what was learned"
-                ],
-                "keywords": ["situation", "action", "result", "learned"],
-                "common_mistakes": ["Too generic", "No numbers", "No reflection"]
-            }
-        },
-        
-        "universal_default": {
-            "expected_points": [
-                "Provide clear context and objective",
-                "Explain methodology or approach used",
-                "Share specific outcomes or metrics",
-                "Reflect on impact or learnings"
-            ],
-            "keywords": ["context", "approach", "outcome", "learned"],
-            "common_mistakes": ["Too abstract", "Missing specifics"]
-        }
-    }
-    
     # Get role-specific rubrics or fallback to universal
     role_key = role.lower().replace(" ", "_").replace("-", "_")
-    role_rubrics = RUBRICS.get(role_key, RUBRICS["universal_default"])
-    
-    # Match question to rubric type
-    for rubric_type, rubric_data in role_rubrics.items():
-        if rubric_type == "default":
-            continue
-        rubric_keywords = rubric_data.get("keywords", [])
-        if any(keyword in q_lower for keyword in rubric_keywords):
-            return rubric_data
+    role_index = load_rubric_library().get(role_key)
+    if role_index is None:
+        return UNIVERSAL_DEFAULT_RUBRIC
+    scanner, rubric_groups, role_default = role_index
+    
+    # Match question to rubric type: first rubric in the library with a keyword in the question
+    best = None
+    if scanner is not None:
+        for match in scanner.finditer(q_lower):
+            if best is None or match.lastindex < best:
+                best = match.lastindex
+                if best == 1:
+                    break
+    if best is not None:
+        return rubric_groups[best]
     
     # Return role-specific default or universal default
-    return role_rubrics.get("default", RUBRICS["universal_default"])
+    return role_default
 
 def evaluate_answer_llm_single(answer, question_data, time_taken_sec=0):
     """Single LLM evaluation call - used by consensus system"""
@@ -923,32 +780,31 @@ def get_fallback_scores(answer, question_data, quality_flags):
 # ROLE MAPPING
 # ===========================================
 
+ROLE_KEY_MAPPINGS = {
+    "data_analyst": "data_analyst",
+    "business_analyst": "business_analyst", 
+    "financial_analyst": "financial_analyst",
+    "data_engineer": "data_engineer",
+    "data_scientist": "data_scientist",
+    "software_developer": "software_developer",
+    "frontend_developer": "frontend_developer", 
+    "backend_developer": "backend_developer",
+    "full_stack_developer": "software_developer",
+    "project_manager": "project_manager",
+    "technical_project_manager": "technical_project_manager",
+    "sales_manager": "sales_manager",
+    "retail_store_manager": "retail_store_manager",
+    "mechanical_engineer": "mechanical_engineer",
+    "design_technician": "design_technician",
+    "customer_care_representative": "customer_care_representative",
+    "sales_executive": "sales_executive",
+    "digital_marketer": "sales_executive"
+}
+
 def get_role_key(job_title):
     """Map job title to role key - Updated for all 14 roles"""
     job_title_lower = job_title.lower().replace(" ", "_").replace("-", "_")
-    
-    role_mappings = {
-        "data_analyst": "data_analyst",
-        "business_analyst": "business_analyst", 
-        "financial_analyst": "financial_analyst",
-        "data_engineer": "data_engineer",
-        "data_scientist": "data_scientist",
-        "software_developer": "software_developer",
-        "frontend_developer": "frontend_developer", 
-        "backend_developer": "backend_developer",
-        "full_stack_developer": "software_developer",
-        "project_manager": "project_manager",
-        "technical_project_manager": "technical_project_manager",
-        "sales_manager": "sales_manager",
-        "retail_store_manager": "retail_store_manager",
-        "mechanical_engineer": "mechanical_engineer",
-        "design_technician": "design_technician",
-        "customer_care_representative": "customer_care_representative",
-        "sales_executive": "sales_executive",
-        "digital_marketer": "sales_executive"
-    }
-    
-    return role_mappings.get(job_title_lower, "data_analyst")
+    return ROLE_KEY_MAPPINGS.get(job_title_lower, "data_analyst")
 
 # ===========================================
 # SKILL EXTRACTION
@@ -1043,79 +899,12 @@ def analyze_introduction(introduction_text, job_title):
 
         # Extract companies
         companies = []
-        known_companies = [
-        # TECH & SOFTWARE
-        'WeWork','Google','Microsoft','Amazon','Apple','Meta','Netflix','Tesla','Salesforce','Oracle','IBM','Adobe','SAP','Intel',
-        'ARM','Sage','Sophos','Autonomy','Imagination Technologies',
-        # FINANCIAL SERVICES - UK
-        'HSBC','Barclays','Lloyds','NatWest','RBS','Standard Chartered','Santander UK','Nationwide','TSB','Metro Bank',
-        'Monzo','Revolut','Starling Bank','Wise','OakNorth','Funding Circle',
-        # CONSULTING & PROFESSIONAL SERVICES
-        'Deloitte','PwC','EY','KPMG','Accenture','McKinsey','BCG','Bain','Capgemini','Atos','Cognizant','Infosys','TCS','Wipro',
-        # RETAIL - UK
-        'Tesco','Sainsburys','Asda','Morrisons','Marks & Spencer','M&S','John Lewis','Waitrose','Aldi','Lidl','Co-op','Boots','Superdrug',
-        'Next','Primark','Argos','Screwfix','B&Q','Homebase',
-        # TELECOM
-        'BT','Vodafone','EE','O2','Three','Virgin Media','Sky','TalkTalk','Plusnet','Openreach',
-        # ENERGY & UTILITIES
-        'BP','Shell','British Gas','Centrica','SSE','EON','EDF Energy','Scottish Power','Octopus Energy','OVO Energy','National Grid',
-        # PHARMA & HEALTHCARE
-        'GSK','GlaxoSmithKline','AstraZeneca','Roche','Pfizer','Novartis','Bupa','NHS','Lloyds Pharmacy',
-        # AUTOMOTIVE & MANUFACTURING
-        'Rolls Royce','Jaguar Land Rover','JLR','McLaren','Aston Martin','Bentley','BAE Systems','GKN','Dyson','JCB',
-        # MEDIA & ENTERTAINMENT
-        'BBC','ITV','Channel 4','Pearson','RELX','Reuters','Financial Times','Guardian','Telegraph','Daily Mail',
-        # FOOD & BEV
-        'Unilever','Diageo','Coca Cola','Nestle','Cadbury','Mondelez','Whitbread','Greggs','Pret','Costa','Starbucks','McDonalds',
-        'KFC','Nandos','Pizza Express','Wagamama','Deliveroo','Just Eat',
-        # TRANSPORT & LOGISTICS
-        'British Airways','easyJet','Ryanair','Virgin Atlantic','DHL','Royal Mail','Yodel','Hermes','Evri','DPD','UPS','FedEx',
-        # REAL ESTATE & CONSTRUCTION
-        'Barratt','Taylor Wimpey','Persimmon','Berkeley Group','Savills','CBRE','Jones Lang LaSalle','JLL','Knight Frank','Rightmove','Zoopla',
-        # INSURANCE
-        'Aviva','Prudential','Legal & General','Direct Line','Admiral','RSA','Zurich','AXA','Allianz','AIG',
-        # E-COMMERCE & STARTUPS
-        'ASOS','Boohoo','Ocado','Farfetch','Moonpig','Not on the High Street','Checkout.com','Uber','Lyft',
-        # ACCOUNTING & AUDIT
-        'Grant Thornton','BDO','RSM','Mazars','Smith & Williamson',
-        # RECRUITMENT & HR
-        'Hays','Robert Half','Michael Page','Reed','Randstad','Adecco','Manpower','Capita','Serco',
-        # FINTECH & BANKING
-        'Tide','Chip','Curve','Zopa','Clearbank','Tandem','Atom Bank','GoCardless','TransferGo','WorldRemit','Currencycloud',
-        # TECH STARTUPS
-        'Darktrace','BenevolentAI','Improbable','Graphcore','Citymapper','Gousto','Graze','Thought Machine','Snyk','UiPath','Cleo','Hopin','Cazoo','BrewDog',
-        # HEALTHTECH
-        'Babylon','Push Doctor','Echo','Medopad','Owkin','Benevolent',
-        # PROPTECH
-        'Nested','Purplebricks','OpenRent','Settled','Goodlord',
-        # EDTECH
-        'FutureLearn','Teachable','GoStudent','Century Tech','Third Space Learning',
-        # HOSPITALITY/LEISURE & OTHER UK BRANDS
-        'Iceland','Poundland','Home Bargains','Farmfoods','Premier Inn','Travelodge','Holiday Inn','Hilton','Marriott',
-        'Wetherspoons','Slug and Lettuce','All Bar One','Mitchells & Butlers','PureGym','The Gym Group','Virgin Active','David Lloyd','Nuffield Health',
-        'JD Sports','Sports Direct','Footasylum','Schuh','Office','Wickes','Toolstation','Dunelm','The Range','Wilko',
-        # PUBLIC SECTOR
-        'Civil Service','HMRC','DWP','Home Office','MOD','DVLA','DVSA','Environment Agency','NHS England','NHS Digital','Network Rail',
-        'Transport for London','TfL','Highways England','HS2',
-        # MEDIA HOUSES
-        'Bloomberg','Conde Nast','Hearst','Dennis Publishing','Bauer Media','Future Publishing','DC Thomson','Immediate Media',
-        # CHARITIES
-        'Oxfam','Save the Children','British Red Cross','Cancer Research UK','Macmillan','RSPCA','NSPCC','Barnardos',
-        # UNIVERSITIES (as employers)
-        'Oxford University','Cambridge University','Imperial College','UCL','LSE','Kings College','Edinburgh University','Manchester University',
-        # SCOTLAND/WALES/NI HIGHLIGHTS
-        'Standard Life','Scottish Widows','Baillie Gifford','Skyscanner','FanDuel','Brewdog','Arnold Clark',
-        'Admiral Insurance','Compare the Market','Go Compare','IQE',
-        'Kainos','Almac','Neueda','Sandicliffe']
-        text_lc = introduction_text.lower()
-        print(f"DEBUG: Checking {len(known_companies)} known companies")
-        
-        for kc in known_companies:
-            pat = re.compile(r'(?<!\w)' + re.escape(kc.lower()) + r'(?!\w)')
-            if pat.search(text_lc):
-                if kc not in companies:
-                    companies.append(kc)
-                    print(f"DEBUG: Found known company: {kc}")
+        gazetteer = get_company_gazetteer()
+        print(f"DEBUG: Checking {len(gazetteer)} known companies")
+
+        for kc in gazetteer.find(introduction_text):
+            companies.append(kc)
+            print(f"DEBUG: Found known company: {kc}")
         if not companies:
             print("DEBUG: No known companies found, trying regex patterns")
 
@@ -1169,19 +958,7 @@ def analyze_introduction(introduction_text, job_title):
         
 
         # Extract tools using centralized TOOL_PATTERNS
-        tools = []
-        for tool_name, patterns in TOOL_PATTERNS.items():
-            for pattern in patterns:
-                if any(ch in pattern for ch in r'[](){}?+*|\\'):
-                    rx = re.compile(pattern, re.IGNORECASE)
-                else:
-                    words = re.split(r'\s+', pattern.strip())
-                    rx = re.compile(r'(?<!\w)' + r'\s+'.join(map(re.escape, words)) + r'(?!\w)', re.IGNORECASE)
-                if rx.search(introduction_text):
-                    display_name = tool_name.replace('_', ' ').title()
-                    if display_name not in tools:
-                        tools.append(display_name)
-                    break
+        tools = TOOL_MATCHER.find(introduction_text)
 
         # Extract sectors
         sectors = []
@@ -2668,29 +2445,61 @@ def categorize_skill(skill_name: str) -> str:
     
     return 'general'
 
+SKILL_SYNONYMS_DB = {
+    'autocad': ['cad', 'computer aided design', '2d design', '3d modeling'],
+    'solidworks': ['solid works', '3d modeling', 'parametric design'],
+    'python': ['python programming', 'py', 'python3'],
+    'javascript': ['js', 'ecmascript', 'web programming'],
+    'sql': ['structured query language', 'database querying'],
+    'tableau': ['data visualization', 'business intelligence'],
+    'salesforce': ['sfdc', 'crm', 'customer relationship management'],
+    'react': ['reactjs', 'frontend framework'],
+}
+
+def _build_synonym_index(synonyms_db):
+    """Every known name -> its synonym list, precomputed; a shared synonym belongs to the first skill listing it"""
+    index = {}
+    for main_skill, synonyms in synonyms_db.items():
+        for synonym in synonyms:
+            index.setdefault(synonym, tuple([main_skill] + [s for s in synonyms if s != synonym]))
+    for main_skill, synonyms in synonyms_db.items():
+        index[main_skill] = tuple(synonyms)
+    return MappingProxyType(index)
+
+SKILL_SYNONYM_INDEX = _build_synonym_index(SKILL_SYNONYMS_DB)
+
 def get_skill_synonyms(skill_name: str) -> List[str]:
     """Get all synonyms for a skill"""
-    skill_lower = skill_name.lower().strip()
-    
-    SKILL_SYNONYMS_DB = {
-        'autocad': ['cad', 'computer aided design', '2d design', '3d modeling'],
-        'solidworks': ['solid works', '3d modeling', 'parametric design'],
-        'python': ['python programming', 'py', 'python3'],
-        'javascript': ['js', 'ecmascript', 'web programming'],
-        'sql': ['structured query language', 'database querying'],
-        'tableau': ['data visualization', 'business intelligence'],
-        'salesforce': ['sfdc', 'crm', 'customer relationship management'],
-        'react': ['reactjs', 'frontend framework'],
-    }
-    
-    if skill_lower in SKILL_SYNONYMS_DB:
-        return SKILL_SYNONYMS_DB[skill_lower]
-    
-    for main_skill, synonyms in SKILL_SYNONYMS_DB.items():
-        if skill_lower in synonyms:
-            return [main_skill] + [s for s in synonyms if s != skill_lower]
+    return list(SKILL_SYNONYM_INDEX.get(skill_name.lower().strip(), ()))
+
+def get_skill_vocabulary() -> List[Dict]:
+    """Every skill name the service knows up front, for warming the embedding cache
     
-    return []
+    roles.json core_skills/tools, TOOL_PATTERNS keys and literal variants,
+    SKILL_CATEGORIES and SKILL_SYNONYMS_DB - each as a plain name and with
+    its category, the two forms candidate skills are embedded in.
+    """
+    names = set()
+    for role in load_available_roles().values():
+        names.update(role.get('core_skills', []))
+        names.update(role.get('tools', []))
+    for tool, variants in TOOL_PATTERNS.items():
+        names.add(tool)
+        # Regex variants (lookaheads, alternations) are not skill text
+        names.update(v for v in variants if not re.search(r'[\\()\[\]?*+|^$]', v))
+    for skills in SKILL_CATEGORIES.values():
+        names.update(skills)
+    for skill, synonyms in SKILL_SYNONYMS_DB.items():
+        names.add(skill)
+        names.update(synonyms)
+    
+    vocabulary = []
+    for name in sorted(n.strip() for n in names if n and n.strip()):
+        vocabulary.append({'display_name': name, 'category': 'general'})
+        category = categorize_skill(name)
+        if category != 'general':
+            vocabulary.append({'display_name': name, 'category': category})
+    return vocabulary
 
 def extract_individual_skills_with_confidence(transcript: List[Dict], extracted_context: Dict, job_title: str) -> List[Dict]:
     """Extract individual skills with confidence scores and metadata"""
@@ -2814,37 +2623,39 @@ def determine_skill_proficiency_level(score: int) -> str:
     else:
         return 'beginner'
 
+JOB_SKILL_RELEVANCE = {
+    'design_technician': {
+        'high': ['autocad', 'solidworks', 'revit', 'cad', 'technical drawing', '2d', '3d'],
+        'medium': ['excel', 'project management', 'communication'],
+        'low': ['python', 'sql', 'javascript']
+    },
+    'data_analyst': {
+        'high': ['python', 'sql', 'excel', 'tableau', 'power bi', 'pandas'],
+        'medium': ['statistics', 'reporting', 'visualization'],
+        'low': ['autocad', 'solidworks', 'mechanical design']
+    },
+    'software_developer': {
+        'high': ['python', 'javascript', 'react', 'git', 'sql'],
+        'medium': ['docker', 'aws', 'testing'],
+        'low': ['autocad', 'tableau', 'sales']
+    }
+}
+
+RELEVANCE_WEIGHTS = {'high': 1.0, 'medium': 0.7, 'low': 0.3}
+
+# job key -> ((keyword, weight), ...) in priority order
+_JOB_RELEVANCE_INDEX = MappingProxyType({
+    job_key: tuple((skill, RELEVANCE_WEIGHTS[level]) for level, skills in levels.items() for skill in skills)
+    for job_key, levels in JOB_SKILL_RELEVANCE.items()
+})
+
 def calculate_job_relevance(skill_name: str, job_title: str) -> float:
     """Calculate how relevant this skill is to the specific job title"""
-    job_lower = job_title.lower()
     skill_lower = skill_name.lower()
     
-    job_skill_relevance = {
-        'design_technician': {
-            'high': ['autocad', 'solidworks', 'revit', 'cad', 'technical drawing', '2d', '3d'],
-            'medium': ['excel', 'project management', 'communication'],
-            'low': ['python', 'sql', 'javascript']
-        },
-        'data_analyst': {
-            'high': ['python', 'sql', 'excel', 'tableau', 'power bi', 'pandas'],
-            'medium': ['statistics', 'reporting', 'visualization'],
-            'low': ['autocad', 'solidworks', 'mechanical design']
-        },
-        'software_developer': {
-            'high': ['python', 'javascript', 'react', 'git', 'sql'],
-            'medium': ['docker', 'aws', 'testing'],
-            'low': ['autocad', 'tableau', 'sales']
-        }
-    }
-    
-    job_key = job_lower.replace(' ', '_')
-    
-    if job_key in job_skill_relevance:
-        relevance_map = job_skill_relevance[job_key]
-        
-        for relevance_level, skills in relevance_map.items():
-            if any(s in skill_lower for s in skills):
-                return {'high': 1.0, 'medium': 0.7, 'low': 0.3}[relevance_level]
+    for keyword, weight in _JOB_RELEVANCE_INDEX.get(job_title.lower().replace(' ', '_'), ()):
+        if keyword in skill_lower:
+            return weight
     
     return 0.5
 
@@ -0,0 +1,110 @@
+# manage_embedding_cache.py - Inspect, warm, compact or drop embedding cache partitions
+#
+# Each model gets its own partition under ML_CACHE_DIR (default ./ml_cache),
+# named "<model>-<dimension>", so a second model can be A/B tested without
+# touching the first one's vectors.
+import os
+import sys
+import shutil
+from pathlib import Path
+from embedding_store import EmbeddingStore
+
+USAGE = """Usage:
+  python manage_embedding_cache.py list
+  python manage_embedding_cache.py warm <model_name> <skills_file>        (one skill per line)
+  python manage_embedding_cache.py warm <model_name> --from <partition>  (re-embed another partition's texts)
+  python manage_embedding_cache.py warm <model_name> --vocabulary        (roles.json, TOOL_PATTERNS, categories, synonyms)
+  python manage_embedding_cache.py compact <partition>
+  python manage_embedding_cache.py drop <partition>                      (stop workers using it first)"""
+
+def cache_root():
+    return Path(os.getenv('ML_CACHE_DIR', './ml_cache'))
+
+def partition_dirs():
+    root = cache_root()
+    if not root.exists():
+        return []
+    return sorted(p for p in root.iterdir() if (p / 'embeddings.meta').exists())
+
+def open_partition(name, read_only=True):
+    path = cache_root() / name
+    if not (path / 'embeddings.meta').exists():
+        print(f"No embedding cache partition '{name}' in {cache_root()}")
+        sys.exit(1)
+    return EmbeddingStore(path, read_only=read_only)
+
+def list_partitions():
+    from ml_similarity import SkillSimilarityEngine
+    dirs = partition_dirs()
+    if not dirs:
+        print(f"No embedding cache partitions in {cache_root()}")
+    for path in dirs:
+        store = EmbeddingStore(path, read_only=True)
+        stats = store.stats()
+        namespaces = {}
+        for key in store.keys():
+            namespace, _ = SkillSimilarityEngine.split_cache_key(key)
+            namespaces[namespace or '(legacy)'] = namespaces.get(namespace or '(legacy)', 0) + 1
+        print(f"{path.name}: {stats['persisted_embeddings']} embeddings, {stats['disk_size_mb']} MB, "
+              f"model={stats['model']}, created_at={stats['created_at']}")
+        for namespace, count in sorted(namespaces.items()):
+            print(f"    {namespace}: {count}")
+
+def warm(model_name, source):
+    from ml_similarity import SkillSimilarityEngine
+    if source[0] == '--vocabulary':
+        from interview import get_skill_vocabulary
+        skills = get_skill_vocabulary()
+    elif source[0] == '--from':
+        if len(source) != 2:
+            print(USAGE)
+            sys.exit(1)
+        store = open_partition(source[1])
+        skills = [SkillSimilarityEngine.split_cache_key(key)[1] for key in store.keys()
+                  if SkillSimilarityEngine.split_cache_key(key)[0] is not None]
+    else:
+        with open(source[0], encoding='utf-8') as f:
+            skills = [line.strip() for line in f if line.strip()]
+    
+    engine = SkillSimilarityEngine(model_name)
+    encoded = engine.warm_cache(skills)
+    print(f"Warmed {engine.cache_partition_dir.name}: {len(skills)} skills, {encoded} newly encoded")
+
+def compact(name):
+    from ml_similarity import SkillSimilarityEngine
+    store = open_partition(name, read_only=False)
+    current = SkillSimilarityEngine.cache_namespace_for(store.metadata.get('model'))
+    
+    def keep(key):
+        # Current namespace only; drops old text versions and legacy hashed keys
+        namespace, _ = SkillSimilarityEngine.split_cache_key(key)
+        return namespace == current
+    
+    kept, dropped = store.compact(keep)
+    print(f"Compacted {name}: kept {kept}, dropped {dropped}")
+
+def drop(name):
+    path = cache_root() / name
+    if not (path / 'embeddings.meta').exists():
+        print(f"No embedding cache partition '{name}' in {cache_root()}")
+        sys.exit(1)
+    shutil.rmtree(path)
+    print(f"Dropped {name}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(USAGE)
+        sys.exit(1)
+    
+    command, args = sys.argv[1], sys.argv[2:]
+    if command == 'list' and not args:
+        list_partitions()
+    elif command == 'warm' and len(args) >= 2:
+        warm(args[0], args[1:])
+    elif command == 'compact' and len(args) == 1:
+        compact(args[0])
+    elif command == 'drop' and len(args) == 1:
+        drop(args[0])
+    else:
+        print(USAGE)
+        sys.exit(1)
@@ -0,0 +1,108 @@
+# micro_batching.py - Coalesce concurrent embedding requests into one model call
+import os
+import asyncio
+from ml_similarity import get_similarity_engine
+
+# ===========================================
+# MICRO-BATCHING
+# ===========================================
+#
+# Each request first looks up which of its skill texts the engine has not
+# cached yet, on a worker thread since the lookup takes the cache locks and
+# may page in the store's memory map. The batcher waits up to max_wait_ms for other requests
+# (or until max_batch_size texts are queued), encodes the union in a single
+# model.encode call on a worker thread, and releases every waiting request.
+# The scoring that follows also runs on a worker thread: the vectors are
+# normally still cached, but a read-only store drops puts and the LRU may
+# evict between awaits, and a miss there must not block the event loop.
+
+class EmbeddingMicroBatcher:
+    """Collects uncached skill texts from concurrent requests and embeds them together"""
+
+    def __init__(self, model_name=None, max_batch_size=None, max_wait_ms=None):
+        self.model_name = model_name
+        self.max_batch_size = int(max_batch_size or os.getenv('ML_MICROBATCH_MAX_SIZE', '256'))
+        self.max_wait = float(max_wait_ms if max_wait_ms is not None else os.getenv('ML_MICROBATCH_MAX_WAIT_MS', '5')) / 1000
+
+        self._engine = None
+        self._queue = None       # created inside the running event loop
+        self._worker = None
+
+        self.batches = 0
+        self.requests_batched = 0
+        self.texts_batched = 0
+
+    async def engine(self):
+        """Shared similarity engine; the first call loads it off the event loop"""
+        if self._engine is None:
+            args = (self.model_name,) if self.model_name else ()
+            self._engine = await asyncio.get_running_loop().run_in_executor(None, get_similarity_engine, *args)
+        return self._engine
+
+    async def ensure_embedded(self, texts):
+        """Return once every text is in the engine's embedding cache"""
+        engine = await self.engine()
+        missing = await asyncio.get_running_loop().run_in_executor(None, self._uncached, engine, texts)
+        if not missing:
+            return
+
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put((missing, done))
+        await done
+
+    @staticmethod
+    def _uncached(engine, texts):
+        """Texts with no vector in the memory cache or the store"""
+        return [text for text in dict.fromkeys(texts)
+                if engine._lookup_embedding(engine._get_cache_key(text)) is None]
+
+    def stats(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'requests_batched': self.requests_batched,
+            'texts_batched': self.texts_batched,
+            'avg_requests_per_batch': round(self.requests_batched / self.batches, 2) if self.batches else 0.0
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            # Keep collecting until the batch is full or the wait is over
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            texts = list(dict.fromkeys(text for missing, _ in batch for text in missing))
+            try:
+                # One model call for every request in the batch
+                await loop.run_in_executor(None, self._engine._get_embeddings, texts)
+            except Exception as e:
+                for _, done in batch:
+                    if not done.done():
+                        done.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests_batched += len(batch)
+            self.texts_batched += len(texts)
+            for _, done in batch:
+                if not done.done():
+                    done.set_result(None)
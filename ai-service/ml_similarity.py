@@ -1,28 +1,122 @@
 # ml_similarity.py - Phase 3: Semantic Skill Matching Engine
 import os
+import re
+import tempfile
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import json
-import pickle
+import copy
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from embedding_store import EmbeddingStore
+from cache_utils import LRUCache, ResultCache
+from encoders import load_encoder, DEFAULT_BACKEND
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Embedded once per start-up; the vector identifies the model weights, so a
+# re-published model under the same name does not reuse stale cache rows
+FINGERPRINT_PROBE = 'python programming and data analysis'
+FINGERPRINT_DIMS = 32
+FINGERPRINT_MIN_SIMILARITY = 0.999
+
+def cache_namespace_name(model_name, dim):
+    """Directory (under the cache dir) holding the embedding cache for one model and dimension"""
+    return f"{re.sub(r'[^A-Za-z0-9._-]+', '_', model_name)}-{dim}"
+
+def fingerprints_match(a, b):
+    """True when two model fingerprints come from the same weights (tolerates float noise)"""
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    if a.shape != b.shape or not a.size:
+        return False
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b) or 1.0)) >= FINGERPRINT_MIN_SIMILARITY
+
+# Storage dtype for candidate skill embeddings saved with interviews (float32 or float16)
+STORED_EMBEDDING_DTYPE = os.getenv('ML_STORED_EMBEDDING_DTYPE', 'float32')
+
+def l2_normalize(vectors):
+    """float32 rows scaled to unit length (zero rows stay zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def _similarity_matrix(job_embeddings, candidate_embeddings):
+    # Every embedding is stored unit-length, so cosine similarity is one float32 matmul
+    return job_embeddings @ candidate_embeddings.T
 
 class SkillSimilarityEngine:
     """ML-powered semantic skill matching using SentenceTransformers"""
     
-    def __init__(self, model_name='all-MiniLM-L6-v2', cache_dir='./ml_cache'):
-        """Initialize the similarity engine"""
+    # Thresholds in ascending order; a score reaching the i-th one gets STRENGTH_LABELS[i + 1]
+    STRENGTH_THRESHOLDS = ('weak_match', 'moderate_match', 'strong_match', 'exact_match')
+    STRENGTH_LABELS = ('no_match', 'weak', 'moderate', 'strong', 'exact')
+    
+    # Common technical terms that boost match confidence when both sides mention them
+    TECHNICAL_TERMS = ('python', 'javascript', 'sql', 'react', 'aws', 'docker')
+    
+    # Bump whenever _prepare_skill_text changes what text gets embedded
+    SKILL_TEXT_VERSION = 1
+    
+    # Bump whenever the shape or scoring of similarity results changes
+    RESULT_FORMAT_VERSION = 1
+    
+    # Separates the namespace from the skill text in cache keys
+    CACHE_KEY_SEPARATOR = '::'
+    
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, cache_dir=None,
+                 encode_batch_size=None, encoder_backend=None):
+        """Initialize the similarity engine (encoder_backend: see encoders.ENCODER_BACKENDS)"""
         self.model_name = model_name
-        self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(exist_ok=True)
+        self.encoder_backend = encoder_backend or os.getenv('ML_ENCODER_BACKEND', DEFAULT_BACKEND)
+        # Backends produce slightly different vectors, so each gets its own cache
+        self.encoder_name = model_name if self.encoder_backend == DEFAULT_BACKEND else f"{model_name}@{self.encoder_backend}"
+        self.cache_dir = Path(cache_dir or os.getenv('ML_CACHE_DIR', './ml_cache'))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Encoding options: cache misses are encoded together in batches of this size
+        if encode_batch_size is None:
+            encode_batch_size = int(os.getenv('ML_ENCODE_BATCH_SIZE', '32'))
+        self.encode_batch_size = max(1, int(encode_batch_size))
+        
+        # Cache keys are "<namespace>::<text>"; vectors from another model,
+        # backend or text preparation can never be served
+        self.cache_namespace = self.cache_namespace_for(self.encoder_name)
+        self._cache_key_prefix = self.cache_namespace + self.CACHE_KEY_SEPARATOR
         
         # Load or initialize model
-        print(f"Loading SentenceTransformer model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        print(f"Loading SentenceTransformer model: {model_name} ({self.encoder_backend})")
+        self.model = load_encoder(model_name, self.encoder_backend)
+        probe = np.asarray(self.model.encode([FINGERPRINT_PROBE], normalize_embeddings=True, show_progress_bar=False)[0])
+        self.embedding_dim = int(probe.shape[0])
+        self.model_fingerprint = [round(float(x), 5) for x in probe[:FINGERPRINT_DIMS]]
         
-        # Skill embedding cache for performance
-        self.embedding_cache = self._load_cache()
+        # Skill embedding cache for performance (append-only store on disk,
+        # one partition per model name and embedding dimension)
+        self.cache_read_only = os.getenv('ML_CACHE_READ_ONLY', 'false').lower() == 'true'
+        self.cache_flush_interval = float(os.getenv('ML_CACHE_FLUSH_INTERVAL', '2.0'))
+        self.embedding_store = self._load_cache()
+        
+        # Hot in-memory layer in front of the store, bounded by entries and bytes
+        max_mb = float(os.getenv('ML_CACHE_MAX_MB', '256'))
+        self.embedding_cache = LRUCache(
+            max_entries=int(os.getenv('ML_CACHE_MAX_ENTRIES', '50000')),
+            max_bytes=int(max_mb * 1024 * 1024),
+            sizeof=lambda embedding: embedding.nbytes
+        )
+        self.store_hits = 0
+        self.encoded_count = 0
+        
+        # Similarity results and match reports, keyed by a hash of the skills
+        # plus result_version; recruiters reload the same pairs all day
+        self.result_cache = ResultCache(
+            max_entries=int(os.getenv('ML_RESULT_CACHE_MAX_ENTRIES', '5000')),
+            ttl=float(os.getenv('ML_RESULT_CACHE_TTL', '900')),
+            path=os.getenv('ML_RESULT_CACHE_PATH') or None
+        )
         
         # Similarity thresholds (tunable)
         self.thresholds = {
@@ -32,62 +126,213 @@ class SkillSimilarityEngine:
             'weak_match': 0.45        # Distantly related skills
         }
     
-    def calculate_skill_similarity(self, job_skills, candidate_skills):
-        """Calculate semantic similarity between job requirements and candidate skills"""
+    @property
+    def result_version(self):
+        """Model, text preparation and thresholds: anything that changes a cached result"""
+        return f"{self.cache_namespace}|{json.dumps(self.thresholds, sort_keys=True)}|r{self.RESULT_FORMAT_VERSION}"
+    
+    def _result_key(self, kind, job_skills, candidate_skills, *extra):
+        """Stable content hash of a job/candidate pair (results only depend on each skill's str())"""
+        payload = json.dumps(
+            [kind, self.result_version, [str(s) for s in job_skills], [str(s) for s in candidate_skills], *extra],
+            separators=(',', ':')
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def calculate_skill_similarity(self, job_skills, candidate_skills, skill_embeddings=None, cache_tags=()):
+        """Calculate semantic similarity between job requirements and candidate skills
+        
+        skill_embeddings: optional record stored with the candidate's interview
+        (see build_skill_embeddings_record); its vectors are used instead of re-embedding.
+        cache_tags: e.g. ('interview:<id>',) so invalidate_similarity_results can drop the memoised result.
+        """
         
         if not job_skills or not candidate_skills:
             return {'overall_score': 0.0, 'matches': [], 'coverage': 0.0}
         
+        cache_key = self._result_key('similarity', job_skills, candidate_skills)
+        result = self.result_cache.get(cache_key)
+        if result is not None:
+            return copy.deepcopy(result)
+        
         # Prepare skill texts for embedding
         job_texts = [self._prepare_skill_text(skill) for skill in job_skills]
         candidate_texts = [self._prepare_skill_text(skill) for skill in candidate_skills]
         
         # Get embeddings (with caching)
         job_embeddings = self._get_embeddings(job_texts)
-        candidate_embeddings = self._get_embeddings(candidate_texts)
+        candidate_embeddings = self._get_candidate_embeddings(candidate_texts, skill_embeddings)
         
         # Calculate similarity matrix
-        similarity_matrix = cosine_similarity(job_embeddings, candidate_embeddings)
+        similarity_matrix = _similarity_matrix(job_embeddings, candidate_embeddings)
         
-        matches = []
-        total_similarity = 0.0
+        result = self._summarise_similarity(similarity_matrix, job_skills, candidate_skills)
+        self.result_cache.put(cache_key, copy.deepcopy(result), tags=cache_tags)
+        return result
+    
+    def rank_candidates(self, job_skills, candidates, top_k=None):
+        """Score one job against many candidates with a single similarity computation
         
-        for i, job_skill in enumerate(job_skills):
-            best_match_idx = int(np.argmax(similarity_matrix[i])) 
-            best_similarity = float(similarity_matrix[i][best_match_idx])  
-            
-            match_info = {
+        candidates: list of {'id': ..., 'skills': [...]} where skills are strings or skill dicts,
+        optionally with the candidate's stored 'skill_embeddings' record.
+        Returns per-candidate results (same shape as calculate_skill_similarity) and a ranking.
+        """
+        if not job_skills or not candidates:
+            return {'results': [], 'ranking': [], 'job_skills_count': len(job_skills or []), 'candidates_count': len(candidates or [])}
+        
+        # Embed the job once
+        job_embeddings = self._get_embeddings([self._prepare_skill_text(skill) for skill in job_skills])
+        
+        # Stack every candidate's skills into one matrix; offsets mark each candidate's columns.
+        # Rows come from stored skill_embeddings where available, the rest are looked up together.
+        candidate_texts = []
+        stored_rows = {}
+        offsets = [0]
+        for candidate in candidates:
+            texts = [self._prepare_skill_text(skill) for skill in candidate.get('skills') or []]
+            stored = self.decode_skill_embeddings(candidate.get('skill_embeddings'))
+            if stored:
+                for row, text in enumerate(texts, len(candidate_texts)):
+                    if text in stored:
+                        stored_rows[row] = stored[text]
+            candidate_texts.extend(texts)
+            offsets.append(len(candidate_texts))
+        
+        results = []
+        if candidate_texts:
+            lookup_rows = [row for row in range(len(candidate_texts)) if row not in stored_rows]
+            candidate_embeddings = np.empty((len(candidate_texts), job_embeddings.shape[1]), dtype=np.float32)
+            if lookup_rows:
+                candidate_embeddings[lookup_rows] = self._get_embeddings([candidate_texts[row] for row in lookup_rows])
+            for row, embedding in stored_rows.items():
+                candidate_embeddings[row] = embedding
+            similarity_matrix = _similarity_matrix(job_embeddings, candidate_embeddings)
+        
+        for i, candidate in enumerate(candidates):
+            start, end = offsets[i], offsets[i + 1]
+            if start == end:
+                result = {'overall_score': 0.0, 'matches': [], 'coverage': 0.0, 'method': 'no_skills'}
+            else:
+                result = self._summarise_similarity(similarity_matrix[:, start:end], job_skills, candidate['skills'])
+                result['method'] = 'ml_similarity'
+            result['candidate_id'] = candidate.get('id')
+            results.append(result)
+        
+        order = sorted(range(len(results)), key=lambda i: (-results[i]['overall_score'], -results[i]['coverage']))
+        if top_k:
+            order = order[:int(top_k)]
+        ranking = [
+            {
+                'rank': rank,
+                'candidate_id': results[i]['candidate_id'],
+                'overall_score': results[i]['overall_score'],
+                'coverage': results[i]['coverage']
+            }
+            for rank, i in enumerate(order, 1)
+        ]
+        
+        return {
+            'results': results,
+            'ranking': ranking,
+            'job_skills_count': len(job_skills),
+            'candidates_count': len(candidates)
+        }
+    
+    def embed_skills(self, skills):
+        """Embeddings for a list of skills (strings or skill dicts), through the cache"""
+        return self._get_embeddings([self._prepare_skill_text(skill) for skill in skills])
+    
+    def warm_cache(self, skills, chunk_size=1000):
+        """Embed and persist skills ahead of traffic; returns how many had to be encoded"""
+        encoded_before = self.encoded_count
+        texts = list(dict.fromkeys(t for t in (self._prepare_skill_text(skill) for skill in skills) if t))
+        for start in range(0, len(texts), chunk_size):
+            self._get_embeddings(texts[start:start + chunk_size])
+        self._save_cache()
+        return self.encoded_count - encoded_before
+    
+    def _summarise_similarity(self, similarity_matrix, job_skills, candidate_skills):
+        """Best match per job skill plus strength counts, computed over the whole matrix at once"""
+        n_jobs = len(job_skills)
+        
+        best_idx = similarity_matrix.argmax(axis=1)
+        best_scores = similarity_matrix[np.arange(n_jobs), best_idx].astype(np.float64)
+        rounded_scores = np.round(best_scores, 4)
+        
+        # Strength bucket = number of thresholds the raw score reaches
+        edges = np.array([self.thresholds[name] for name in self.STRENGTH_THRESHOLDS])
+        buckets = np.searchsorted(edges, best_scores, side='right')
+        
+        confidences = self._calculate_confidences(best_scores, job_skills, candidate_skills, best_idx)
+        
+        # Counts use the rounded scores reported in each match
+        strong_count = int(np.count_nonzero(rounded_scores >= self.thresholds['strong_match']))
+        moderate_count = int(np.count_nonzero(rounded_scores >= self.thresholds['moderate_match']))
+        weak_count = int(np.count_nonzero(rounded_scores >= self.thresholds['weak_match']))
+        
+        candidate_names = [str(skill) for skill in candidate_skills]
+        matches = [
+            {
                 'job_skill': str(job_skill),
-                'candidate_skill': str(candidate_skills[best_match_idx]),
-                'similarity_score': round(best_similarity,4),
-                'match_strength': self._classify_match_strength(best_similarity),
-                'confidence': round(float(self._calculate_confidence(best_similarity, job_skill, candidate_skills[best_match_idx])), 4)
+                'candidate_skill': candidate_names[idx],
+                'similarity_score': score,
+                'match_strength': self.STRENGTH_LABELS[bucket],
+                'confidence': confidence
             }
-            
-            matches.append(match_info)
-            total_similarity += best_similarity
+            for job_skill, idx, score, bucket, confidence in zip(
+                job_skills, best_idx.tolist(), rounded_scores.tolist(), buckets.tolist(), np.round(confidences, 4).tolist()
+            )
+        ]
         
-        overall_score = (total_similarity / len(job_skills)) * 100 if job_skills else 0.0
-        coverage = len([m for m in matches if m['similarity_score'] >= self.thresholds['weak_match']]) / len(job_skills) * 100
+        overall_score = best_scores.sum() / n_jobs * 100
+        coverage = weak_count / n_jobs * 100
         
         return {
             'overall_score': round(float(overall_score), 2),
             'coverage': round(float(coverage), 2),
             'matches': matches,
-            'job_skills_count': len(job_skills),
+            'job_skills_count': n_jobs,
             'candidate_skills_count': len(candidate_skills),
-            'strong_matches': len([m for m in matches if m['similarity_score'] >= self.thresholds['strong_match']]),
-            'moderate_matches': len([m for m in matches if m['similarity_score'] >= self.thresholds['moderate_match']]),
-            'weak_matches': len([m for m in matches if m['similarity_score'] >= self.thresholds['weak_match']])
+            'strong_matches': strong_count,
+            'moderate_matches': moderate_count,
+            'weak_matches': weak_count
         }
     
     def find_skill_gaps(self, job_skills, candidate_skills, threshold=0.65):
         """Identify skills the candidate is missing for the job"""
         
         similarity_result = self.calculate_skill_similarity(job_skills, candidate_skills)
+        return self._gaps_from_matches(similarity_result['matches'], threshold)
+    
+    def suggest_skill_improvements(self, candidate_skills, target_role_skills):
+        """Suggest which skills to develop for better job matching"""
         
+        gaps = self.find_skill_gaps(target_role_skills, candidate_skills)
+        return self._suggestions_from_gaps(gaps)
+    
+    def match_report(self, job_skills, candidate_skills, skill_embeddings=None, gap_threshold=0.65, cache_tags=()):
+        """Score, matches, gaps and improvement suggestions from one similarity computation
+        
+        Reports are memoised in the result cache like calculate_skill_similarity,
+        so repeated dashboard refreshes do not recompute anything.
+        """
+        cache_key = self._result_key('report', job_skills, candidate_skills, gap_threshold)
+        report = self.result_cache.get(cache_key)
+        if report is not None:
+            return copy.deepcopy(report)
+        
+        report = self.calculate_skill_similarity(job_skills, candidate_skills, skill_embeddings, cache_tags)
+        gaps = self._gaps_from_matches(report['matches'], gap_threshold)
+        report['gaps'] = gaps
+        report['suggestions'] = self._suggestions_from_gaps(gaps)
+        
+        self.result_cache.put(cache_key, copy.deepcopy(report), tags=cache_tags)
+        return report
+    
+    def _gaps_from_matches(self, matches, threshold):
+        """Job skills whose best candidate match is below threshold, weakest first"""
         gaps = []
-        for match in similarity_result['matches']:
+        for match in matches:
             if match['similarity_score'] < threshold:
                 gaps.append({
                     'missing_skill': match['job_skill'],
@@ -98,11 +343,7 @@ class SkillSimilarityEngine:
         
         return sorted(gaps, key=lambda x: x['similarity_score'])
     
-    def suggest_skill_improvements(self, candidate_skills, target_role_skills):
-        """Suggest which skills to develop for better job matching"""
-        
-        gaps = self.find_skill_gaps(target_role_skills, candidate_skills)
-        
+    def _suggestions_from_gaps(self, gaps):
         suggestions = []
         for gap in gaps[:5]:  # Top 5 suggestions
             suggestions.append({
@@ -130,55 +371,136 @@ class SkillSimilarityEngine:
     
     def _get_embeddings(self, texts):
         """Get embeddings with caching for performance"""
-        embeddings = []
+        cache_keys = [self._get_cache_key(text) for text in texts]
         
-        for text in texts:
-            # Check cache first
-            cache_key = self._get_cache_key(text)
-            if cache_key in self.embedding_cache:
-                embeddings.append(self.embedding_cache[cache_key])
+        # Memory cache first, then the on-disk store; collect unique misses
+        # so they can be encoded in one model call
+        found = {}
+        missing = {}
+        for text, cache_key in zip(texts, cache_keys):
+            if cache_key in found or cache_key in missing:
+                continue
+            embedding = self._lookup_embedding(cache_key)
+            if embedding is None:
+                missing[cache_key] = text
             else:
-                # Generate new embedding
-                embedding = self.model.encode([text])[0]
-                self.embedding_cache[cache_key] = embedding
-                embeddings.append(embedding)
+                found[cache_key] = embedding
         
-        # Save updated cache
-        self._save_cache()
+        # Other workers may already have encoded some of these
+        if missing and self.embedding_store.refresh():
+            for cache_key in list(missing):
+                embedding = self._lookup_embedding(cache_key)
+                if embedding is not None:
+                    found[cache_key] = embedding
+                    del missing[cache_key]
         
-        return np.array(embeddings)
-    
-    def _classify_match_strength(self, similarity_score):
-        """Classify the strength of a skill match"""
-        if similarity_score >= self.thresholds['exact_match']:
-            return 'exact'
-        elif similarity_score >= self.thresholds['strong_match']:
-            return 'strong'
-        elif similarity_score >= self.thresholds['moderate_match']:
-            return 'moderate'
-        elif similarity_score >= self.thresholds['weak_match']:
-            return 'weak'
-        else:
-            return 'no_match'
+        if missing:
+            new_embeddings = l2_normalize(self.model.encode(
+                list(missing.values()),
+                batch_size=self.encode_batch_size,
+                show_progress_bar=False
+            ))
+            self.encoded_count += len(missing)
+            # Stored unit-length; appended to disk by the store's background flush
+            for cache_key, embedding in zip(missing.keys(), new_embeddings):
+                self.embedding_store.put(cache_key, embedding)
+                self.embedding_cache.put(cache_key, embedding)
+                found[cache_key] = embedding
+        
+        return np.array([found[cache_key] for cache_key in cache_keys], dtype=np.float32)
     
-    def _calculate_confidence(self, similarity_score, job_skill, candidate_skill):
-        """Calculate confidence in the match"""
-        # Higher confidence for exact text matches
-        if str(job_skill).lower() == str(candidate_skill).lower():
-            return 1.0
+    def _get_candidate_embeddings(self, texts, skill_embeddings=None):
+        """Candidate embeddings, read from a stored skill_embeddings record where possible"""
+        stored = self.decode_skill_embeddings(skill_embeddings)
+        if not stored:
+            return self._get_embeddings(texts)
         
-        # Adjust confidence based on similarity score
-        base_confidence = float(similarity_score)
+        missing = [text for text in texts if text not in stored]
+        if missing:
+            stored = dict(stored)
+            stored.update(zip(missing, self._get_embeddings(missing)))
+        return np.array([stored[text] for text in texts], dtype=np.float32)
+    
+    # ---------- precomputed candidate embeddings ----------
+    
+    def candidate_skill_texts(self, verified_skills):
+        """Every text form a candidate's verified skills are matched under
         
-        # Boost confidence for common technical terms
-        technical_terms = ['python', 'javascript', 'sql', 'react', 'aws', 'docker']
-        job_lower = str(job_skill).lower()
-        candidate_lower = str(candidate_skill).lower()
+        app.py matches on display names; semantic_api and enhance_job_candidate_matching
+        match on name + category. Both forms are stored so either path finds its vectors.
+        """
+        texts = []
+        for skill in verified_skills or []:
+            name = skill.get('display_name', skill.get('skill', ''))
+            for text in (self._prepare_skill_text(name), self._prepare_skill_text(skill)):
+                if text and text not in texts:
+                    texts.append(text)
+        return texts
+    
+    def build_skill_embeddings_record(self, verified_skills, dtype=None):
+        """Embed a candidate's verified skills once, as a compact binary record for the interview document"""
+        dtype = np.dtype(dtype or STORED_EMBEDDING_DTYPE)
+        texts = self.candidate_skill_texts(verified_skills)
+        if not texts:
+            return None
+        
+        vectors = self._get_embeddings(texts).astype(dtype)
+        return {
+            'model': self.encoder_name,
+            'dim': int(vectors.shape[1]),
+            'dtype': dtype.name,
+            'count': len(texts),
+            'texts': texts,
+            'vectors': vectors.tobytes(),
+            'created_at': datetime.utcnow()
+        }
+    
+    def decode_skill_embeddings(self, record):
+        """{text: float32 vector} from a stored record, or None if missing or from another encoder"""
+        # Tagged with the encoder (model@backend): int8/ONNX vectors differ from fp32 torch ones
+        if not record or record.get('model') != self.encoder_name:
+            return None
+        try:
+            vectors = np.frombuffer(bytes(record['vectors']), dtype=np.dtype(record['dtype']))
+            # float16 records (and records written before vectors were unit-length) are re-normalised
+            vectors = l2_normalize(vectors.reshape(int(record['count']), int(record['dim'])))
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable skill_embeddings record: {e}")
+            return None
+        return dict(zip(record['texts'], vectors))
+    
+    def _lookup_embedding(self, cache_key):
+        """Embedding from the memory cache or the persistent store, or None"""
+        embedding = self.embedding_cache.get(cache_key)
+        if embedding is not None:
+            return embedding
         
-        if any(term in job_skill.lower() and term in candidate_skill.lower() for term in technical_terms):
-            base_confidence += 0.1
+        embedding = self.embedding_store.get(cache_key)
+        if embedding is None:
+            return None
+        
+        # Copy out of the memory map into the bounded hot cache
+        embedding = np.array(embedding, dtype=np.float32)
+        self.embedding_cache.put(cache_key, embedding)
+        self.store_hits += 1
+        return embedding
+    
+    def _calculate_confidences(self, best_scores, job_skills, candidate_skills, best_idx):
+        """Calculate confidence in each job skill's best match"""
+        job_lower = [str(skill).lower() for skill in job_skills]
+        candidate_lower = [str(skill).lower() for skill in candidate_skills]
         
-        return min(1.0, base_confidence)
+        # Term presence per skill, then compare each job skill with its best candidate
+        job_terms = np.array([[term in text for term in self.TECHNICAL_TERMS] for text in job_lower], dtype=bool)
+        candidate_terms = np.array([[term in text for term in self.TECHNICAL_TERMS] for text in candidate_lower], dtype=bool)
+        shared_term = (job_terms & candidate_terms[best_idx]).any(axis=1)
+        
+        # Higher confidence for exact text matches
+        exact_text = np.array([job_lower[i] == candidate_lower[j] for i, j in enumerate(best_idx.tolist())], dtype=bool)
+        
+        # Boost confidence for common technical terms
+        boosted = np.minimum(1.0, best_scores + 0.1 * shared_term)
+        return np.where(exact_text, 1.0, boosted)
     
     def _calculate_gap_severity(self, similarity_score):
         """Calculate how severe a skill gap is"""
@@ -202,45 +524,218 @@ class SkillSimilarityEngine:
         
         return [f"Search for '{skill} tutorials'", f"'{skill} documentation'", f"Online '{skill} courses'"]
     
+    @classmethod
+    def cache_namespace_for(cls, encoder_name):
+        """Cache key namespace for an encoder ("unit": vectors are stored L2-normalised)"""
+        return f"{encoder_name}/t{cls.SKILL_TEXT_VERSION}/unit"
+    
     def _get_cache_key(self, text):
-        """Generate cache key for text"""
-        import hashlib
-        return hashlib.md5(text.encode()).hexdigest()
+        """Cache key for text: the prepared text itself, namespaced (no hashing, nothing to collide)"""
+        return self._cache_key_prefix + text
+    
+    @classmethod
+    def split_cache_key(cls, cache_key):
+        """(namespace, text) for a cache key, or (None, cache_key) for legacy hashed keys"""
+        namespace, separator, text = cache_key.partition(cls.CACHE_KEY_SEPARATOR)
+        if not separator:
+            return None, cache_key
+        return namespace, text
     
     def _load_cache(self):
-        """Load embedding cache from disk"""
-        cache_file = self.cache_dir / 'embeddings_cache.pkl'
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'rb') as f:
-                    return pickle.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load embedding cache: {e}")
-        return {}
+        """Open this model's embedding cache partition, invalidating it if the model weights changed"""
+        self.cache_partition_dir = self.cache_dir / cache_namespace_name(self.encoder_name, self.embedding_dim)
+        metadata = {
+            'model': self.encoder_name,
+            'dim': self.embedding_dim,
+            'fingerprint': self.model_fingerprint,
+            'created_at': datetime.utcnow().isoformat()
+        }
+        store = EmbeddingStore(
+            self.cache_partition_dir,
+            read_only=self.cache_read_only,
+            flush_interval=self.cache_flush_interval,
+            metadata=metadata
+        )
+        
+        stored_fingerprint = store.metadata.get('fingerprint')
+        if len(store) and stored_fingerprint and not fingerprints_match(stored_fingerprint, self.model_fingerprint):
+            print(f"⚠️ Embedding cache '{self.cache_partition_dir.name}' was built with different model weights - invalidating")
+            if self.cache_read_only:
+                # Cannot clear it, so read from an empty store instead
+                store = EmbeddingStore(tempfile.mkdtemp(prefix='ml_cache_'), read_only=True)
+            else:
+                store.drop()
+                store.metadata = metadata
+        
+        # The old embeddings_cache.pkl is keyed by an MD5 of the text, which
+        # cannot be mapped back to the text; those skills are re-encoded on demand
+        legacy_file = self.cache_dir / 'embeddings_cache.pkl'
+        if legacy_file.exists():
+            print(f"Note: {legacy_file.name} uses hashed keys and is no longer read; it can be deleted")
+        return store
     
     def _save_cache(self):
-        """Save embedding cache to disk"""
+        """Flush new embeddings to disk (only writes what was added)"""
         try:
-            cache_file = self.cache_dir / 'embeddings_cache.pkl'
-            with open(cache_file, 'wb') as f:
-                pickle.dump(self.embedding_cache, f)
+            self.embedding_store.flush()
         except Exception as e:
             print(f"Warning: Could not save embedding cache: {e}")
     
     def get_cache_stats(self):
         """Get cache statistics"""
         return {
-            'cached_embeddings': len(self.embedding_cache),
-            'cache_size_mb': len(pickle.dumps(self.embedding_cache)) / (1024 * 1024),
-            'model_name': self.model_name
+            'cached_embeddings': len(self.embedding_store),
+            'cache_size_mb': self.embedding_cache.nbytes / (1024 * 1024),
+            'memory_cache': self.embedding_cache.stats(),
+            'result_cache': self.result_cache.stats(),
+            'result_version': self.result_version,
+            'store_hits': self.store_hits,
+            'encoded': self.encoded_count,
+            'store': self.embedding_store.stats(),
+            'model_name': self.model_name,
+            'encoder_backend': self.encoder_backend,
+            'cache_namespace': self.cache_namespace,
+            'cache_partition': self.cache_partition_dir.name,
+            'embedding_dim': self.embedding_dim,
+            'encode_batch_size': self.encode_batch_size
+        }
+
+# ===========================================
+# SHARED ENGINE REGISTRY
+# ===========================================
+
+# One engine per model name for the whole process. Loading the
+# SentenceTransformer and the embedding cache takes seconds, so request
+# handlers must never construct SkillSimilarityEngine directly. Nothing
+# heavy is imported or loaded until the first get_similarity_engine() call
+# (or warm_up_similarity_engine() when eager start-up is configured).
+_engines = {}
+_engine_status = {}
+_engine_locks = {}
+_warm_status = {}
+_registry_lock = threading.Lock()
+
+def get_similarity_engine(model_name=DEFAULT_MODEL_NAME):
+    """Return the shared engine for model_name, loading it on first use (thread-safe)"""
+    engine = _engines.get(model_name)
+    if engine is not None:
+        return engine
+    
+    with _registry_lock:
+        model_lock = _engine_locks.setdefault(model_name, threading.Lock())
+    
+    # Per-model lock so concurrent first requests wait for a single load
+    with model_lock:
+        engine = _engines.get(model_name)
+        if engine is not None:
+            return engine
+        
+        _engine_status[model_name] = {'ready': False, 'loading': True, 'load_time_sec': None, 'error': None}
+        started = time.perf_counter()
+        try:
+            engine = SkillSimilarityEngine(model_name=model_name)
+        except Exception as e:
+            _engine_status[model_name] = {'ready': False, 'loading': False, 'load_time_sec': None, 'error': str(e)}
+            raise
+        
+        load_time = round(time.perf_counter() - started, 3)
+        _engines[model_name] = engine
+        _engine_status[model_name] = {
+            'ready': True,
+            'loading': False,
+            'load_time_sec': load_time,
+            'loaded_at': datetime.utcnow().isoformat(),
+            'error': None
         }
+        print(f"✅ Similarity engine '{model_name}' ready in {load_time}s")
+        return engine
+
+def warm_up_similarity_engine(model_name=DEFAULT_MODEL_NAME, background=True, vocabulary=None, retries=None):
+    """Load the shared engine ahead of the first request
+    
+    vocabulary: optional callable returning skills to embed into the cache
+    once the model is loaded (e.g. interview.get_skill_vocabulary); progress
+    is reported under 'warm_cache' in get_engine_status. A failed load or
+    warm-up is retried with exponential backoff (ML_WARMUP_RETRIES, default
+    3); after the last attempt the status is marked 'gave_up'.
+    """
+    retries = int(retries if retries is not None else (os.getenv('ML_WARMUP_RETRIES') or 3))
+    
+    def _status(**fields):
+        status = {'ready': False, 'skills': None, 'encoded': None, 'warm_time_sec': None,
+                  'error': None, 'attempts': 0, 'gave_up': False}
+        status.update(fields)
+        _warm_status[model_name] = status
+    
+    def _warm():
+        delay = 5.0
+        for attempt in range(1, retries + 2):
+            try:
+                engine = get_similarity_engine(model_name)
+                started = time.perf_counter()
+                skills = list(vocabulary()) if vocabulary is not None else []
+                encoded = engine.warm_cache(skills) if skills else 0
+                _status(ready=True, skills=len(skills), encoded=encoded, attempts=attempt,
+                        warm_time_sec=round(time.perf_counter() - started, 3))
+                if vocabulary is not None:
+                    print(f"✅ Embedding cache warmed: {len(skills)} skills ({encoded} newly encoded)")
+                return
+            except Exception as e:
+                gave_up = attempt > retries
+                _status(error=str(e), attempts=attempt, gave_up=gave_up)
+                if gave_up:
+                    print(f"⚠️  Similarity engine warm-up failed after {attempt} attempts, giving up: {e}")
+                    return
+                print(f"⚠️  Similarity engine warm-up failed (attempt {attempt}), retrying in {delay:.0f}s: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, 300.0)
+    
+    # Pending before the model starts loading, so readiness never reports
+    # true between the engine loading and the warm set being encoded
+    _status()
+    
+    if not background:
+        _warm()
+        return None
+    
+    thread = threading.Thread(target=_warm, name=f"warmup-{model_name}", daemon=True)
+    thread.start()
+    return thread
+
+def get_engine_status(model_name=DEFAULT_MODEL_NAME):
+    """Readiness and load time of the shared engine, for health checks"""
+    status = dict(_engine_status.get(model_name, {'ready': False, 'loading': False, 'load_time_sec': None, 'error': None}))
+    status['model_name'] = model_name
+    if model_name in _warm_status:
+        status['warm_cache'] = dict(_warm_status[model_name])
+    return status
+
+def invalidate_similarity_results(*tags):
+    """Drop memoised results stored under tags (e.g. 'interview:<id>') in every loaded engine"""
+    return sum(engine.result_cache.invalidate(*tags) for engine in list(_engines.values()))
+
+def is_engine_warm(model_name=DEFAULT_MODEL_NAME):
+    """True once the engine is loaded and any requested cache warm-up has finished"""
+    warm = _warm_status.get(model_name)
+    return bool(_engine_status.get(model_name, {}).get('ready')) and (warm is None or warm['ready'])
+
+def warm_up_gave_up(model_name=DEFAULT_MODEL_NAME):
+    """True when start-up warm-up failed on every attempt (the error is in get_engine_status)"""
+    return bool(_warm_status.get(model_name, {}).get('gave_up'))
 
 # Utility functions for integration
-def enhance_job_candidate_matching(job_skills, candidate_enhanced_skills):
+def compute_skill_embeddings(enhanced_skills):
+    """skill_embeddings record for an interview's enhanced_skills (None when there are no skills)"""
+    verified_skills = (enhanced_skills or {}).get('verified_skills')
+    if not verified_skills:
+        return None
+    return get_similarity_engine().build_skill_embeddings_record(verified_skills)
+
+def enhance_job_candidate_matching(job_skills, candidate_enhanced_skills, skill_embeddings=None):
     """Enhanced matching using ML similarity + Phase 2 enhanced skills"""
     
-    # Initialize ML engine
-    similarity_engine = SkillSimilarityEngine()
+    # Shared ML engine
+    similarity_engine = get_similarity_engine()
     
     # Extract candidate skills for comparison
     candidate_skills = []
@@ -256,75 +751,230 @@ def enhance_job_candidate_matching(job_skills, candidate_enhanced_skills):
         return {'overall_score': 0, 'matches': [], 'coverage': 0, 'method': 'no_skills'}
     
     # Calculate ML similarity
-    ml_result = similarity_engine.calculate_skill_similarity(job_skills, candidate_skills)
+    ml_result = similarity_engine.calculate_skill_similarity(job_skills, candidate_skills, skill_embeddings)
     ml_result['method'] = 'ml_similarity'
     
     return ml_result
 
-def batch_improve_all_matches():
-    """Utility to recalculate all job-candidate matches with ML similarity"""
-    from models import Interview, db
+def batch_improve_all_matches(page_size=500, workers=None, checkpoint_path=None, resume=True):
+    """Recalculate ML similarity metadata for every completed interview as a streaming job
     
-    print("🚀 Starting batch ML similarity improvement...")
+    Interviews are read in _id order, page_size at a time. Each page's skills
+    are encoded in one batched call, per-interview updates are built on a
+    worker pool, and the page is written with one unordered bulk_write while
+    the next page is being scored. After every write the last _id is saved
+    to checkpoint_path, so an interrupted run resumes where it stopped.
+    Returns a throughput summary.
+    """
+    from bson import ObjectId
+    from pymongo import UpdateOne
+    from concurrent.futures import ThreadPoolExecutor
+    from models import db
     
-    # Get all completed interviews
-    interviews = list(db.interviews.find({'status': 'completed', 'enhanced_skills': {'$exists': True}}))
+    similarity_engine = get_similarity_engine()
+    workers = workers or int(os.getenv('ML_BATCH_WORKERS') or min(8, (os.cpu_count() or 2)))
+    checkpoint_path = Path(checkpoint_path or similarity_engine.cache_dir / 'batch_improve_checkpoint.json')
     
-    similarity_engine = SkillSimilarityEngine()
-    updated_count = 0
+    query = {'status': 'completed', 'enhanced_skills': {'$exists': True}}
+    # Only the model tags are needed to decide whether an interview is already current
+    projection = {'enhanced_skills.verified_skills': 1, 'skill_embeddings.model': 1,
+                  'ml_similarity_metadata.ml_model_version': 1}
     
-    for interview in interviews:
-        try:
-            enhanced_skills = interview.get('enhanced_skills', {})
-            if not enhanced_skills.get('verified_skills'):
-                continue
-            
-            # Add ML similarity metadata
-            ml_metadata = {
+    summary = {'processed': 0, 'updated': 0, 'embeddings_backfilled': 0, 'errors': 0, 'pages': 0}
+    last_id = None
+    if resume and checkpoint_path.exists():
+        checkpoint = json.loads(checkpoint_path.read_text())
+        last_id = ObjectId(checkpoint['last_id'])
+        summary.update({key: checkpoint[key] for key in summary if key in checkpoint})
+        print(f"↩️  Resuming batch ML similarity improvement after {last_id} ({summary['processed']} already processed)")
+    resumed_from = summary['processed']
+    
+    total = summary['processed'] + db.interviews.count_documents(dict(query, **({'_id': {'$gt': last_id}} if last_id else {})))
+    print(f"🚀 Starting batch ML similarity improvement: {total} interviews, pages of {page_size}, {workers} workers")
+    
+    def build_update(interview):
+        enhanced_skills = interview.get('enhanced_skills', {})
+        if not enhanced_skills.get('verified_skills'):
+            return None
+        
+        # Embedding records are tagged with encoder_name (model@backend off
+        # torch), so compare against that; a re-run leaves current interviews alone
+        embeddings_current = (interview.get('skill_embeddings') or {}).get('model') == similarity_engine.encoder_name
+        metadata_current = (interview.get('ml_similarity_metadata') or {}).get('ml_model_version') == similarity_engine.model_name
+        if embeddings_current and metadata_current:
+            return None
+        
+        # Add ML similarity metadata
+        update = {
+            'ml_similarity_metadata': {
                 'ml_similarity_enabled': True,
                 'ml_model_version': similarity_engine.model_name,
                 'ml_updated_at': datetime.utcnow()
             }
+        }
+        # Backfill precomputed skill embeddings (missing or from another encoder)
+        if not embeddings_current:
+            update['skill_embeddings'] = similarity_engine.build_skill_embeddings_record(enhanced_skills['verified_skills'])
+        return update
+    
+    def score_page(interviews):
+        # One batched encode for every skill on the page; workers then hit the cache
+        similarity_engine._get_embeddings(list(dict.fromkeys(
+            text for interview in interviews
+            for text in similarity_engine.candidate_skill_texts(interview.get('enhanced_skills', {}).get('verified_skills'))
+        )))
+        
+        def safe_update(interview):
+            try:
+                return build_update(interview)
+            except Exception as e:
+                print(f"Error updating interview {interview.get('_id')}: {e}")
+                return e
+        
+        return list(pool.map(safe_update, interviews))
+    
+    def write_page(interviews, updates):
+        operations = [
+            UpdateOne({'_id': interview['_id']}, {'$set': update})
+            for interview, update in zip(interviews, updates)
+            if isinstance(update, dict)
+        ]
+        if operations:
+            db.interviews.bulk_write(operations, ordered=False)
+        return interviews[-1]['_id'], updates
+    
+    def finish_page(page_result):
+        page_last_id, updates = page_result
+        summary['pages'] += 1
+        summary['processed'] += len(updates)
+        summary['updated'] += sum(1 for update in updates if isinstance(update, dict))
+        summary['embeddings_backfilled'] += sum(1 for update in updates if isinstance(update, dict) and 'skill_embeddings' in update)
+        summary['errors'] += sum(1 for update in updates if isinstance(update, Exception))
+        
+        tmp_path = checkpoint_path.with_name(checkpoint_path.name + '.tmp')
+        tmp_path.write_text(json.dumps(dict(summary, last_id=str(page_last_id), saved_at=datetime.utcnow().isoformat())))
+        os.replace(tmp_path, checkpoint_path)
+        
+        elapsed = time.perf_counter() - started
+        rate = (summary['processed'] - resumed_from) / elapsed if elapsed else 0.0
+        remaining = max(0, total - summary['processed'])
+        eta = f", ETA {remaining / rate:.0f}s" if rate and remaining else ''
+        print(f"   {summary['processed']}/{total} processed, {summary['updated']} updated "
+              f"({rate:.1f} interviews/s{eta})")
+    
+    started = time.perf_counter()
+    pending_write = None
+    with ThreadPoolExecutor(max_workers=workers) as pool, ThreadPoolExecutor(max_workers=1) as writer:
+        while True:
+            page_query = dict(query, _id={'$gt': last_id}) if last_id else query
+            interviews = list(db.interviews.find(page_query, projection).sort('_id', 1).limit(page_size))
+            if not interviews:
+                break
+            last_id = interviews[-1]['_id']
             
-            # Update interview record
-            db.interviews.update_one(
-                {'_id': interview['_id']},
-                {'$set': {'ml_similarity_metadata': ml_metadata}}
-            )
-            
-            updated_count += 1
+            updates = score_page(interviews)
             
-        except Exception as e:
-            print(f"Error updating interview {interview.get('_id')}: {e}")
+            # At most one write in flight: page N is written while page N+1 is scored
+            if pending_write is not None:
+                finish_page(pending_write.result())
+            pending_write = writer.submit(write_page, interviews, updates)
+        
+        if pending_write is not None:
+            finish_page(pending_write.result())
     
-    print(f"✅ Updated {updated_count} interviews with ML similarity metadata")
-    return updated_count
+    similarity_engine._save_cache()
+    checkpoint_path.unlink(missing_ok=True)
+    
+    elapsed = time.perf_counter() - started
+    summary['elapsed_sec'] = round(elapsed, 2)
+    summary['interviews_per_sec'] = round((summary['processed'] - resumed_from) / elapsed, 1) if elapsed else 0.0
+    summary['resumed_from'] = resumed_from
+    print(f"✅ Updated {summary['updated']} of {summary['processed']} interviews "
+          f"({summary['embeddings_backfilled']} skill embeddings backfilled, {summary['errors']} errors) "
+          f"in {summary['elapsed_sec']}s - {summary['interviews_per_sec']} interviews/s")
+    return summary
 
 # Testing and validation
 if __name__ == "__main__":
+    import sys
+    
+    # Tolerances for the checks below; the process exits 1 when one is exceeded
+    COSINE_REGRESSION_TOLERANCE = 1e-5     # matmul scores vs scikit-learn cosine_similarity
+    BACKEND_MIN_COSINE = 0.98              # faster backend's vectors vs fp32 torch, per text
+    BACKEND_MAX_SCORE_DELTA = 3.0          # points on the 0-100 scores vs fp32 torch
+    failures = []
+    
     # Test the similarity engine
     engine = SkillSimilarityEngine()
     
-    # Test case 1: Frontend development
-    job_skills = ["React Developer", "JavaScript Programming", "CSS Styling"]
-    candidate_skills = ["Frontend Development", "React.js", "Web Development", "HTML/CSS"]
+    test_cases = [
+        # Test case 1: Frontend development
+        ("Frontend Development",
+         ["React Developer", "JavaScript Programming", "CSS Styling"],
+         ["Frontend Development", "React.js", "Web Development", "HTML/CSS"]),
+        # Test case 2: Data Analysis
+        ("Data Analysis",
+         ["Python Programming", "Data Visualization", "Statistical Analysis"],
+         ["Python", "Tableau", "Excel", "Statistics", "Data Science"]),
+    ]
+    
+    results = []
+    for number, (name, job_skills, candidate_skills) in enumerate(test_cases, 1):
+        result = engine.calculate_skill_similarity(job_skills, candidate_skills)
+        results.append(result)
+        if number > 1:
+            print()
+        print(f"Test {number} - {name}:")
+        print(f"Overall Score: {result['overall_score']}")
+        print(f"Coverage: {result['coverage']}%")
+        for match in result['matches']:
+            print(f"  {match['job_skill']} → {match['candidate_skill']} ({match['similarity_score']:.3f})")
     
-    result = engine.calculate_skill_similarity(job_skills, candidate_skills)
-    print("Test 1 - Frontend Development:")
-    print(f"Overall Score: {result['overall_score']}")
-    print(f"Coverage: {result['coverage']}%")
-    for match in result['matches']:
-        print(f"  {match['job_skill']} → {match['candidate_skill']} ({match['similarity_score']:.3f})")
+    print(f"\nCache Stats: {engine.get_cache_stats()}")
     
-    # Test case 2: Data Analysis
-    job_skills = ["Python Programming", "Data Visualization", "Statistical Analysis"]
-    candidate_skills = ["Python", "Tableau", "Excel", "Statistics", "Data Science"]
+    # Regression check: unit-vector matmul scores match scikit-learn cosine_similarity on raw vectors
+    try:
+        from sklearn.metrics.pairwise import cosine_similarity
+    except ImportError:
+        print("\nscikit-learn not installed - skipping cosine regression check")
+    else:
+        max_difference = 0.0
+        for _, job_skills, candidate_skills in test_cases:
+            job_texts = [engine._prepare_skill_text(skill) for skill in job_skills]
+            candidate_texts = [engine._prepare_skill_text(skill) for skill in candidate_skills]
+            expected = cosine_similarity(engine.model.encode(job_texts), engine.model.encode(candidate_texts))
+            actual = _similarity_matrix(engine._get_embeddings(job_texts), engine._get_embeddings(candidate_texts))
+            max_difference = max(max_difference, float(np.abs(actual - expected).max()))
+        passed = max_difference <= COSINE_REGRESSION_TOLERANCE
+        print(f"\nCosine regression check: max difference {max_difference:.2e} ({'OK' if passed else 'FAILED'})")
+        if not passed:
+            failures.append('cosine regression')
     
-    result = engine.calculate_skill_similarity(job_skills, candidate_skills)
-    print("\nTest 2 - Data Analysis:")
-    print(f"Overall Score: {result['overall_score']}")
-    print(f"Coverage: {result['coverage']}%")
-    for match in result['matches']:
-        print(f"  {match['job_skill']} → {match['candidate_skill']} ({match['similarity_score']:.3f})")
+    # Accuracy check for faster backends: same test cases against fp32 PyTorch
+    if engine.encoder_backend != DEFAULT_BACKEND:
+        from encoders import compare_encoders
+        reference = SkillSimilarityEngine(encoder_backend=DEFAULT_BACKEND)
+        texts = [engine._prepare_skill_text(skill) for _, job_skills, candidate_skills in test_cases
+                 for skill in job_skills + candidate_skills]
+        report = compare_encoders(engine.model, reference.model, texts)
+        
+        max_score_delta = 0.0
+        for result, (_, job_skills, candidate_skills) in zip(results, test_cases):
+            expected = reference.calculate_skill_similarity(job_skills, candidate_skills)
+            max_score_delta = max(max_score_delta, abs(result['overall_score'] - expected['overall_score']),
+                                  *(abs(a['similarity_score'] - b['similarity_score']) * 100
+                                    for a, b in zip(result['matches'], expected['matches'])))
+        
+        print(f"\n{engine.encoder_backend} vs fp32 {DEFAULT_BACKEND}:")
+        print(f"  Vector cosine: min {report['min_cosine']}, mean {report['mean_cosine']}")
+        print(f"  Max score difference: {max_score_delta:.2f} points")
+        print(f"  Encode latency: {report['encode_ms']}ms vs {report['reference_encode_ms']}ms ({report['speedup']}x)")
+        passed = report['min_cosine'] >= BACKEND_MIN_COSINE and max_score_delta <= BACKEND_MAX_SCORE_DELTA
+        print(f"  Accuracy check (min cosine >= {BACKEND_MIN_COSINE}, score difference <= {BACKEND_MAX_SCORE_DELTA}): "
+              f"{'OK' if passed else 'FAILED'}")
+        if not passed:
+            failures.append(f"{engine.encoder_backend} accuracy")
     
-    print(f"\nCache Stats: {engine.get_cache_stats()}")
+    if failures:
+        print(f"\nFAILED: {', '.join(failures)}")
+        sys.exit(1)
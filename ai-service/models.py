@@ -1,6 +1,7 @@
 # models.py - UPDATED WITH NORMALIZED SCHEMA
 import os
 import uuid
+import threading
 from datetime import datetime, timedelta
 from bson import ObjectId
 from pymongo import MongoClient, ReturnDocument, IndexModel, ASCENDING, DESCENDING, TEXT
@@ -123,6 +124,55 @@ def calculate_confidence_score(evidence, mention_count, skill, role):
     
     return min(1.0, max(0.0, confidence))
 
+def compute_interview_skill_embeddings(enhanced_skills):
+    """Precompute skill embeddings for an interview so matching can skip re-embedding"""
+    try:
+        from ml_similarity import compute_skill_embeddings
+        return compute_skill_embeddings(enhanced_skills)
+    except Exception as e:
+        # Matching falls back to embedding on demand, so never block the save
+        print(f"⚠️ Skill embedding precompute skipped: {e}")
+        return None
+
+def store_interview_skill_embeddings(interview_id, candidate_id, enhanced_skills):
+    """Compute an interview's skill embeddings, $set them on the document and index them"""
+    skill_embeddings = compute_interview_skill_embeddings(enhanced_skills)
+    if not skill_embeddings:
+        return None
+    try:
+        interviews_collection.update_one({'_id': interview_id}, {'$set': {'skill_embeddings': skill_embeddings}})
+    except Exception as e:
+        # batch_improve_all_matches backfills interviews saved without embeddings
+        print(f"⚠️ Skill embeddings not saved for interview {interview_id}: {e}")
+        return None
+
+    # Keep this process's candidate search index current
+    try:
+        from candidate_index import index_interview
+        index_interview(interview_id, candidate_id, (enhanced_skills or {}).get('verified_skills'), skill_embeddings)
+    except Exception as e:
+        print(f"⚠️ Candidate index insert skipped: {e}")
+    return skill_embeddings
+
+def schedule_interview_skill_embeddings(interview_id, candidate_id, enhanced_skills):
+    """Run store_interview_skill_embeddings on a background thread
+
+    Loading the model (on the first save in a process) and encoding take
+    seconds, so the interview-completion request never waits for them.
+    """
+    if os.getenv('ML_PRECOMPUTE_EMBEDDINGS', 'true').lower() != 'true':
+        return None
+    if not (enhanced_skills or {}).get('verified_skills'):
+        return None
+    thread = threading.Thread(
+        target=store_interview_skill_embeddings,
+        args=(interview_id, candidate_id, enhanced_skills),
+        name=f"skill-embeddings-{interview_id}",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
 def calculate_role_relevance(skill, category, role):
     """Calculate how relevant a skill is to the target role"""
     role_lower = role.lower()
@@ -559,6 +609,17 @@ class Interview:
         interview_id = interview_result.inserted_id
         print(f"INTERVIEW CREATE -> {interview_id}")
 
+        # Phase 3: candidate skill vectors stored as a compact binary blob,
+        # computed after the save and then added to the candidate search index
+        schedule_interview_skill_embeddings(interview_id, candidate_id, interview_data['enhanced_skills'])
+
+        # Memoised similarity results for this candidate are stale now
+        try:
+            from ml_similarity import invalidate_similarity_results
+            invalidate_similarity_results(f"interview:{interview_id}", f"candidate:{candidate_id}")
+        except Exception as e:
+            print(f"⚠️ Similarity result invalidation skipped: {e}")
+
         # Create skill assessments (separate collection)
         skill_ratings = summary.get('skill_ratings', [])
         if skill_ratings:
@@ -583,7 +644,7 @@ class Interview:
             query['role'] = {'$regex': job_title, '$options': 'i'}
 
         interviews = list(
-            interviews_collection.find(query).sort('completed_at', -1).limit(int(limit))
+            interviews_collection.find(query, {'skill_embeddings': 0}).sort('completed_at', -1).limit(int(limit))
         )
         
         # Enrich with candidate data
@@ -610,8 +671,8 @@ class Interview:
         if not oid:
             return None
             
-        # Get main interview
-        interview = interviews_collection.find_one({'_id': oid})
+        # Get main interview (binary skill vectors are for matching only)
+        interview = interviews_collection.find_one({'_id': oid}, {'skill_embeddings': 0})
         if not interview:
             return None
             
@@ -645,6 +706,18 @@ class Interview:
         
         return interview
 
+    @staticmethod
+    def get_skill_embeddings(interview_ids):
+        """Stored skill_embeddings records keyed by interview id string"""
+        oids = [oid for oid in (_oid(i) for i in interview_ids or []) if oid]
+        if not oids:
+            return {}
+        cursor = interviews_collection.find(
+            {'_id': {'$in': oids}, 'skill_embeddings': {'$exists': True}},
+            {'skill_embeddings': 1}
+        )
+        return {str(doc['_id']): doc['skill_embeddings'] for doc in cursor}
+
     @staticmethod  
     def get_candidate_skills_summary(candidate_id):
         """Get aggregated skills across all interviews for a candidate"""
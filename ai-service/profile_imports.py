@@ -0,0 +1,63 @@
+# profile_imports.py - Import-time profile of the AI service entry points
+#
+# Runs each import in a fresh interpreter with `python -X importtime` and
+# reports its cumulative cost, whether the heavy ML stack got pulled in, and
+# what those heavy imports cost on their own (now paid on the first
+# similarity call instead of at start-up).
+#
+# Usage: python profile_imports.py [module ...]     (default: app semantic_api)
+import os
+import sys
+import subprocess
+
+HEAVY_MODULES = ('torch', 'sentence_transformers', 'transformers', 'sklearn')
+
+def profile_import(statement):
+    """(total_ms, {direct import: cumulative ms}, {every package imported}) for statement in a clean interpreter"""
+    env = dict(os.environ)
+    env.setdefault('OPENAI_API_KEY', 'profile-imports-placeholder')  # interview.py builds a client at import
+    env['ML_WARMUP_ON_START'] = 'false'
+    env['ML_REQUIRE_WARM_START'] = 'false'
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    total_ms = 0.0
+    direct = {}
+    packages = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # One leading space, then two more per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        ms = int(cumulative) / 1000
+        packages.add(name.split('.')[0])
+        if depth == 0:
+            total_ms += ms
+        elif depth == 1:
+            direct[name] = direct.get(name, 0) + ms
+    return total_ms, direct, packages
+
+def report(modules):
+    heavy_ms, _, _ = profile_import('import ' + ', '.join(['sentence_transformers', 'sklearn.metrics.pairwise']))
+    print(f"Heavy ML stack on its own (sentence_transformers + sklearn): {heavy_ms:.0f}ms")
+
+    for module in modules:
+        total_ms, direct, packages = profile_import(f'import {module}')
+        loaded = [name for name in HEAVY_MODULES if name in packages]
+        print(f"\nimport {module}: {total_ms:.0f}ms")
+        for name, ms in sorted(direct.items(), key=lambda item: -item[1])[:8]:
+            print(f"  {name:<28} {ms:8.1f}ms")
+        if loaded:
+            print(f"  heavy modules imported eagerly: {', '.join(loaded)}")
+        else:
+            print(f"  heavy modules deferred until the first similarity call (saves ~{heavy_ms:.0f}ms)")
+
+if __name__ == "__main__":
+    report(sys.argv[1:] or ['app', 'semantic_api'])
@@ -1,32 +1,101 @@
 # semantic_api.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import List, Union, Dict, Any
+from typing import List, Union, Dict, Any, Optional
+from dotenv import load_dotenv
 import uvicorn
-from ml_similarity import SkillSimilarityEngine
+import os
+import asyncio
+from ml_similarity import warm_up_similarity_engine, get_engine_status, is_engine_warm, warm_up_gave_up
+from micro_batching import EmbeddingMicroBatcher
+
+load_dotenv()
 
 app = FastAPI(title="GenHR ML Similarity API")
-engine = SkillSimilarityEngine()  # loads all-MiniLM-L6-v2
+
+# Same start-up options as app.py: ML_WARMUP_ON_START loads the engine in the
+# background, ML_WARM_VOCABULARY also embeds the known skill vocabulary, and
+# ML_REQUIRE_WARM_START refuses traffic (503) until both are done - unless
+# warm-up fails on every retry, in which case /health reports the error
+ML_WARM_VOCABULARY = os.getenv('ML_WARM_VOCABULARY', 'true').lower() == 'true'
+ML_REQUIRE_WARM_START = os.getenv('ML_REQUIRE_WARM_START', 'false').lower() == 'true'
+
+# Concurrent requests share one model call (ML_MICROBATCH_MAX_SIZE / ML_MICROBATCH_MAX_WAIT_MS)
+batcher = EmbeddingMicroBatcher()
+
+def skill_vocabulary():
+    # interview.py (and its OpenAI client) is only imported when warming the vocabulary
+    from interview import get_skill_vocabulary
+    return get_skill_vocabulary()
+
+@app.on_event("startup")
+def warm_up():
+    # Shared engine from the registry; by default it loads on the first request
+    if os.getenv('ML_WARMUP_ON_START', 'false').lower() == 'true' or ML_REQUIRE_WARM_START:
+        warm_up_similarity_engine(vocabulary=skill_vocabulary if (ML_WARM_VOCABULARY or ML_REQUIRE_WARM_START) else None)
+
+@app.middleware("http")
+async def require_warm_start(request: Request, call_next):
+    if ML_REQUIRE_WARM_START and request.url.path not in ('/', '/health') and not is_engine_warm() and not warm_up_gave_up():
+        return JSONResponse(
+            {"success": False, "error": "Service warming up", "ml_engine": get_engine_status()},
+            status_code=503,
+            headers={"Retry-After": "5"}
+        )
+    return await call_next(request)
+
+@app.get("/health")
+def health():
+    return {"status": "healthy", "ml_engine": get_engine_status(), "micro_batching": batcher.stats()}
 
 class Req(BaseModel):
     job_skills: List[Union[str, Dict[str, Any]]]
     candidate_skills: Dict[str, Any]  # expected to contain 'verified_skills' like your enhanced_skills
 
-@app.post("/ml/skill-similarity")
-def ml_skill_similarity(req: Req):
-    # Pull verified skills out of enhanced skills dict if needed
-    cand_verified = req.candidate_skills.get("verified_skills", [])
-    # Convert to the engine’s expected list
+class RankCandidate(BaseModel):
+    id: Union[str, int]
+    candidate_skills: Dict[str, Any]  # enhanced_skills with 'verified_skills'
+
+class RankReq(BaseModel):
+    job_skills: List[Union[str, Dict[str, Any]]]
+    candidates: List[RankCandidate]
+    top_k: Optional[int] = None
+
+def to_candidate_list(candidate_skills: Dict[str, Any]):
+    # Pull verified skills out of enhanced skills dict and convert to the engine’s expected list
     candidate_list = []
-    for s in cand_verified:
+    for s in candidate_skills.get("verified_skills", []):
         candidate_list.append({
             "skill": s.get("display_name", s.get("skill", "")),
             "category": s.get("category", ""),
             "score": s.get("score", 0),
         })
-    result = engine.calculate_skill_similarity(req.job_skills, candidate_list)
+    return candidate_list
+
+@app.post("/ml/skill-similarity")
+async def ml_skill_similarity(req: Req):
+    engine = await batcher.engine()
+    candidate_list = to_candidate_list(req.candidate_skills)
+    # Uncached skills are encoded together with other in-flight requests.
+    # Scoring runs on a worker thread: it is usually all cache hits, but a
+    # read-only store or LRU eviction can send it back to the model.
+    await batcher.ensure_embedded([engine._prepare_skill_text(s) for s in req.job_skills + candidate_list])
+    result = await asyncio.get_running_loop().run_in_executor(
+        None, engine.calculate_skill_similarity, req.job_skills, candidate_list)
     result["method"] = "ml_similarity"
     return result
 
+@app.post("/ml/rank-candidates")
+async def ml_rank_candidates(req: RankReq):
+    # One job embedding, one stacked candidate matrix, one matmul for the whole pool
+    engine = await batcher.engine()
+    candidates = [{"id": c.id, "skills": to_candidate_list(c.candidate_skills)} for c in req.candidates]
+    await batcher.ensure_embedded([engine._prepare_skill_text(s) for s in req.job_skills]
+                                  + [engine._prepare_skill_text(s) for c in candidates for s in c["skills"]])
+    # Large pools mean real CPU work (and possible re-encodes): keep it off the event loop
+    return await asyncio.get_running_loop().run_in_executor(
+        None, lambda: engine.rank_candidates(req.job_skills, candidates, top_k=req.top_k))
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=5001)
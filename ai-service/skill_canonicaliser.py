@@ -0,0 +1,55 @@
+# skill_canonicaliser.py - Map raw skill tokens to canonical TOOL_PATTERNS names
+from typing import Dict, Iterable, List, Set
+
+# ===========================================
+# REVERSE INDEX
+# ===========================================
+#
+# A pattern set ({canonical: [variant, ...]}) is turned into one
+# variant -> canonical dict, so canonicalising a token is a single lookup
+# instead of a scan over every canonical entry and variant. Variants are
+# compared stripped and lowercased; when two canonicals share a variant the
+# first one listed wins, as with the old linear scans.
+#
+# Indexes are cached per pattern set by identity: module-level tables like
+# TOOL_PATTERNS are indexed once per process. Call clear_canonicaliser_cache()
+# after mutating a pattern dict in place.
+
+class SkillCanonicaliser:
+    """Precomputed variant -> canonical index for one pattern set"""
+
+    def __init__(self, tool_patterns: Dict[str, List[str]]):
+        index = {}
+        for canonical, variants in tool_patterns.items():
+            for variant in variants:
+                index.setdefault(variant.strip().lower(), canonical)
+        self.index = index
+
+    def canonical(self, token: str) -> str:
+        """Canonical name for token, or the token stripped and lowercased if it is unknown"""
+        t = token.strip().lower()
+        return self.index.get(t, t)
+
+    def canonicalise(self, tokens: Iterable[str]) -> Set[str]:
+        """Set of canonical names for tokens"""
+        index = self.index
+        out = set()
+        for raw in tokens:
+            t = raw.strip().lower()
+            out.add(index.get(t, t))
+        return out
+
+_canonicalisers = {}   # id(pattern set) -> (pattern set, SkillCanonicaliser)
+
+def get_canonicaliser(tool_patterns: Dict[str, List[str]]) -> SkillCanonicaliser:
+    """Canonicaliser for tool_patterns, built on first use"""
+    cached = _canonicalisers.get(id(tool_patterns))
+    # Holding the pattern set keeps its id from being reused by another object
+    if cached is None or cached[0] is not tool_patterns:
+        cached = (tool_patterns, SkillCanonicaliser(tool_patterns))
+        _canonicalisers[id(tool_patterns)] = cached
+    return cached[1]
+
+def clear_canonicaliser_cache():
+    """Forget every cached index (after editing a pattern set in place)"""
+    _canonicalisers.clear()
@@ -0,0 +1,120 @@
+"""
+Backfill tests for ml_similarity.batch_improve_all_matches
+
+Runs the job against an in-memory interviews collection and a deterministic
+encoder registered as a non-default backend, so no MongoDB or model download
+is needed. Run with: python -m pytest test_batch_improve.py
+"""
+
+import sys
+import types
+import hashlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pymongo')
+bson = pytest.importorskip('bson')
+
+import encoders
+import ml_similarity
+
+class HashEncoder:
+    """Deterministic stand-in for a SentenceTransformer (counts encoded texts)"""
+
+    def __init__(self, dim=32):
+        self.dim = dim
+        self.encoded = 0
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, show_progress_bar=False, **kwargs):
+        self.encoded += len(texts)
+        vectors = np.array([
+            np.frombuffer(hashlib.sha256(text.encode('utf-8')).digest(), dtype=np.uint8)[:self.dim]
+            for text in texts
+        ], dtype=np.float32) + 1.0
+        return ml_similarity.l2_normalize(vectors) if normalize_embeddings else vectors
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+class _Cursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents.sort(key=lambda document: document[key], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    def __iter__(self):
+        return iter(self.documents)
+
+class InterviewsCollection:
+    """The slice of a pymongo collection batch_improve_all_matches uses; records every $set"""
+
+    def __init__(self, documents):
+        self.documents = {document['_id']: document for document in documents}
+        self.writes = []
+
+    def _matching(self, query):
+        after = (query.get('_id') or {}).get('$gt')
+        return [dict(document) for document in self.documents.values()
+                if document.get('status') == query.get('status') and 'enhanced_skills' in document
+                and (after is None or document['_id'] > after)]
+
+    def count_documents(self, query):
+        return len(self._matching(query))
+
+    def find(self, query, projection=None):
+        return _Cursor(self._matching(query))
+
+    def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            update = operation._doc['$set']
+            self.writes.append(update)
+            self.documents[operation._filter['_id']].update(update)
+
+def _interview(*skills):
+    return {
+        '_id': bson.ObjectId(),
+        'status': 'completed',
+        'enhanced_skills': {'verified_skills': [{'display_name': skill, 'category': 'technical'} for skill in skills]}
+    }
+
+@pytest.fixture
+def backfill_env(monkeypatch, tmp_path):
+    encoder = HashEncoder()
+    monkeypatch.setitem(encoders.ENCODER_BACKENDS, 'torch-int8', lambda model_name: encoder)
+    monkeypatch.setenv('ML_ENCODER_BACKEND', 'torch-int8')
+    monkeypatch.setenv('ML_CACHE_DIR', str(tmp_path / 'ml_cache'))
+    monkeypatch.setenv('ML_RESULT_CACHE_PATH', '')
+    monkeypatch.setattr(ml_similarity, '_engines', {})
+    monkeypatch.setattr(ml_similarity, '_engine_status', {})
+
+    interviews = InterviewsCollection([
+        _interview('Python', 'SQL'),
+        _interview('React', 'TypeScript', 'CSS'),
+        _interview('Excel'),
+    ])
+    monkeypatch.setitem(sys.modules, 'models', types.SimpleNamespace(db=types.SimpleNamespace(interviews=interviews)))
+    return encoder, interviews, tmp_path / 'checkpoint.json'
+
+def test_backfill_is_idempotent_on_non_default_backend(backfill_env):
+    encoder, interviews, checkpoint_path = backfill_env
+
+    first = ml_similarity.batch_improve_all_matches(page_size=2, workers=2, checkpoint_path=checkpoint_path)
+    assert first['embeddings_backfilled'] == 3
+    assert first['errors'] == 0
+    assert {document['skill_embeddings']['model'] for document in interviews.documents.values()} == \
+        {f"{ml_similarity.DEFAULT_MODEL_NAME}@torch-int8"}
+
+    writes_before, encoded_before = len(interviews.writes), encoder.encoded
+    second = ml_similarity.batch_improve_all_matches(page_size=2, workers=2, checkpoint_path=checkpoint_path)
+    assert second['processed'] == 3
+    assert second['updated'] == 0
+    assert second['embeddings_backfilled'] == 0
+    assert interviews.writes[writes_before:] == []
+    assert encoder.encoded == encoded_before
@@ -160,7 +160,7 @@ export default async function handler(req, res) {
     const candidateInterview = await db.collection('interviews').findOne({
       candidate_id: candidate._id,
       status: 'completed'
-    });
+    }, { projection: { skill_embeddings: 0 } });
 
     if (!candidateInterview) {
       return res.status(400).json({
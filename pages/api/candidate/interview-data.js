@@ -101,7 +101,7 @@ export default async function handler(req, res) {
     // Step 2: Get candidate's latest interview
     const latestInterview = await db.collection('interviews').findOne(
       { candidate_id: new ObjectId(candidate._id) },
-      { sort: { completed_at: -1 } }
+      { sort: { completed_at: -1 }, projection: { skill_embeddings: 0 } }
     );
 
     if (!latestInterview) {
@@ -128,7 +128,7 @@ export default async function handler(req, res) {
     const interviews = await db.collection('interviews').find({
       candidate_id: { $in: candidateIds },
       status: 'completed'
-    }).toArray();
+    }, { projection: { skill_embeddings: 0 } }).toArray();
 
     const interviewMap = {};
     interviews.forEach(interview => {
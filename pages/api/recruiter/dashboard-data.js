@@ -752,7 +752,7 @@ export default async function handler(req, res) {
       db.collection('candidates').find({}).toArray(),
       db.collection('interviews').find({ 
         status: 'completed' 
-      }).sort({ completed_at: -1 }).toArray()
+      }, { projection: { skill_embeddings: 0 } }).sort({ completed_at: -1 }).toArray()
     ]);
 
     // Create candidate interview lookup map
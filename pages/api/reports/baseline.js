@@ -62,7 +62,7 @@ export default async function handler(req, res){
 
       const interview = await db.collection("interviews").findOne(
         { candidate_id: cand._id },
-        { sort: { completed_at: -1 } }
+        { sort: { completed_at: -1 }, projection: { skill_embeddings: 0 } }
       );
       if (!interview) continue;
 